@@ -0,0 +1,186 @@
+import csv
+import io
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.serializers import DateTimeField
+
+from reviews.constants import EXPORT_CHUNK_SIZE
+from reviews.models import GenreTitle, Review, Title
+from .renderers import FastJSONRenderer
+
+
+def accepts_gzip(header):
+    """Принимает ли клиент gzip по заголовку Accept-Encoding.
+
+    Кодировка с q=0 запрещена; `*` задаёт вес для не перечисленных
+    кодировок, явный gzip его перекрывает.
+    """
+    weights = {}
+    for entry in header.split(','):
+        coding, *params = entry.split(';')
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+    return weights.get('gzip', weights.get('*', 0.0)) > 0
+
+
+class Export:
+    """Выгрузка таблицы потоком порций строк.
+
+    Строки читаются итератором БД в порядке id порциями по `chunk_size`,
+    поэтому память не зависит от размера таблицы. fields задаёт колонки
+    выгрузки и lookups values(), связанные данные порции дочитываются в
+    represent одним запросом.
+    """
+
+    queryset = None
+    fields = {}
+
+    def __init__(self, chunk_size=EXPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    @property
+    def columns(self):
+        return list(self.fields)
+
+    def chunks(self):
+        rows = self.queryset.order_by('id').values(
+            *self.fields.values()
+        ).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield self.represent([
+                {
+                    column: row[lookup]
+                    for column, lookup in self.fields.items()
+                }
+                for row in chunk
+            ])
+
+    def represent(self, rows):
+        return rows
+
+
+class TitleExport(Export):
+    queryset = Title.objects.all()
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'rating': 'rating',
+        'review_count': 'review_count',
+        'category': 'category__slug',
+    }
+
+    @property
+    def columns(self):
+        return [*super().columns, 'genre']
+
+    def represent(self, rows):
+        # Порция упорядочена по id, поэтому связи выбираются по
+        # диапазону id, а не длинным списком параметров.
+        genres = {}
+        for title_id, slug in GenreTitle.objects.filter(
+            title_id__gte=rows[0]['id'], title_id__lte=rows[-1]['id']
+        ).order_by('genre__name', 'genre_id').values_list(
+            'title_id', 'genre__slug'
+        ):
+            genres.setdefault(title_id, []).append(slug)
+        for row in rows:
+            row['genre'] = genres.get(row['id'], [])
+        return rows
+
+
+class ReviewExport(Export):
+    queryset = Review.objects.all()
+    fields = {
+        'id': 'id',
+        'title': 'title_id',
+        'author': 'author__username',
+        'text': 'text',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }
+
+    def represent(self, rows):
+        to_representation = DateTimeField().to_representation
+        for row in rows:
+            row['pub_date'] = to_representation(row['pub_date'])
+        return rows
+
+
+def ndjson_stream(export):
+    render = FastJSONRenderer().render
+    for rows in export.chunks():
+        yield b''.join(render(row) + b'\n' for row in rows)
+
+
+def csv_stream(export):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, export.columns)
+    writer.writeheader()
+    for rows in export.chunks():
+        writer.writerows(
+            {
+                column: ' '.join(value) if isinstance(value, list) else value
+                for column, value in row.items()
+            }
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+EXPORTS = {
+    'titles': TitleExport,
+    'reviews': ReviewExport,
+}
+
+FORMATS = {
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+    'csv': (csv_stream, 'text/csv; charset=utf-8'),
+}
+
+
+def export_response(request, dataset, export_format):
+    """Потоковый ответ с выгрузкой, сжатый gzip, если клиент его принимает."""
+    stream, content_type = FORMATS[export_format]
+    content = stream(EXPORTS[dataset]())
+    gzipped = accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if gzipped:
+        content = compress_sequence(content)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    if gzipped:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['Content-Disposition'] = (
+        f'attachment; filename="{dataset}.{export_format}"'
+    )
+    return response
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Формат выгрузки задаётся расширением в URL, а не заголовком Accept.
+
+    Ошибки (401, 403, 404) выводятся первым рендерером - JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
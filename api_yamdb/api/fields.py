@@ -0,0 +1,109 @@
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from reviews.snapshots import snapshots
+
+
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    """Список слагов, который загружается из БД одним запросом."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        if not all(isinstance(slug, str) for slug in data):
+            child.fail('invalid')
+        objects = child.get_objects(data)
+        for slug in data:
+            if slug not in objects:
+                child.fail(
+                    'does_not_exist',
+                    slug_name=child.slug_field,
+                    value=smart_str(slug)
+                )
+        return list({slug: objects[slug] for slug in data}.values())
+
+
+class SlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, загружающий список слагов одним запросом."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+    def get_objects(self, slugs):
+        return {
+            getattr(obj, self.slug_field): obj
+            for obj in self.get_queryset().filter(
+                **{f'{self.slug_field}__in': slugs}
+            )
+        }
+
+
+class SnapshotSlugRelatedField(SlugRelatedField):
+    """Слаг категории или жанра, который ищется в снимке таблицы.
+
+    Перед поиском версия снимка сверяется с БД, так что вместо выборки
+    из таблицы выполняется только чтение счётчика версий.
+    """
+
+    def get_objects(self, slugs):
+        return snapshots.get(
+            self.get_queryset().model, fresh=True
+        ).get_many(slugs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, int)) or isinstance(data, bool):
+            self.fail('invalid')
+        slug = smart_str(data)
+        obj = self.get_objects([slug]).get(slug)
+        if obj is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=slug
+            )
+        return obj
+
+
+class SnapshotNestedField(serializers.Field):
+    """Вложенная категория или жанр, представление берётся из снимка.
+
+    Представление строится сериализатором один раз на версию снимка
+    и дальше переиспользуется готовым словарём для всех произведений
+    и запросов. Объект, которого ещё нет в снимке, сериализуется как
+    обычно.
+    """
+
+    def __init__(self, serializer_class, many=False, **kwargs):
+        kwargs['read_only'] = True
+        self.serializer_class = serializer_class
+        self.many = many
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if self.many:
+            # Жанры из prefetch_related берутся списком, без создания
+            # менеджера связи для каждого произведения.
+            prefetched = getattr(instance, '_prefetched_objects_cache', {})
+            if self.source in prefetched:
+                return prefetched[self.source]
+            return getattr(instance, self.source).all()
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        objects = value if self.many else [value]
+        if not objects:
+            return []
+        snapshot = snapshots.get(type(objects[0]))
+        representations = [
+            snapshot.represent(self.serializer_class, obj.pk)
+            or self.serializer_class(obj, context=self.context).data
+            for obj in objects
+        ]
+        return representations if self.many else representations[0]
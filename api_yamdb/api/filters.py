@@ -1,13 +1,109 @@
-from django_filters.rest_framework import CharFilter, FilterSet
+from django.db.models import Q
+from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
+from rest_framework.filters import OrderingFilter, SearchFilter
 
-from reviews.models import Title
+from core.fields import PREFIX_UPPER_BOUND, search_key
+from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
+from reviews.snapshots import snapshots
+
+
+def startswith_key(field_name, value):
+    """Поиск по началу ключа как диапазон, который использует индекс."""
+    key = search_key(value)
+    return Q(**{
+        f'{field_name}__gte': key,
+        f'{field_name}__lt': key + PREFIX_UPPER_BOUND
+    })
+
+
+class SearchKeyFilter(SearchFilter):
+    """SearchFilter по полям SearchKeyField.
+
+    `?search=` работает как SearchFilter с icontains: каждое слово
+    должно входить хотя бы в одно из полей. Сравниваются ключи поиска,
+    поэтому регистр не учитывается и для кириллицы. `?prefix=` ищет
+    строку целиком по началу ключа - диапазоном по индексу.
+    """
+
+    prefix_param = 'prefix'
+
+    def get_prefix(self, request):
+        return request.query_params.get(self.prefix_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        if not search_fields:
+            return queryset
+        for term in self.get_search_terms(request):
+            conditions = Q()
+            for field_name in search_fields:
+                conditions |= Q(**{
+                    f'{field_name}__contains': search_key(term)
+                })
+            queryset = queryset.filter(conditions)
+        prefix = self.get_prefix(request)
+        if prefix:
+            conditions = Q()
+            for field_name in search_fields:
+                conditions |= startswith_key(field_name, prefix)
+            queryset = queryset.filter(conditions)
+        return queryset
+
+
+class StableOrderingFilter(OrderingFilter):
+    """OrderingFilter, добавляющий `id` для однозначного порядка.
+
+    `id` сортируется в том же направлении, что и первое поле, поэтому
+    запрос читает составной индекс (поле, id) без сортировки в памяти
+    в обе стороны. Без параметра `ordering` сортировка по релевантности,
+    заданная полнотекстовым поиском, не заменяется сортировкой по умолчанию.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if (self.ordering_param not in request.query_params
+                and queryset.query.extra_order_by):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[-1].lstrip('-') in ('id', 'pk'):
+            return ordering
+        direction = '-' if ordering[0].startswith('-') else ''
+        return (*ordering, f'{direction}id')
 
 
 class TitleFilter(FilterSet):
-    name = CharFilter(field_name='name', lookup_expr='icontains')
-    genre = CharFilter(field_name='genre__slug')
-    category = CharFilter(field_name='category__slug')
+    name = CharFilter(method='filter_name')
+    genre = CharFilter(method='filter_genre')
+    category = CharFilter(method='filter_category')
+    q = CharFilter(method='filter_search')
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
 
     class Meta:
         model = Title
-        fields = ('name', 'category', 'genre', 'year')
+        fields = (
+            'name', 'category', 'genre', 'year', 'q',
+            'year_min', 'year_max', 'rating_min'
+        )
+
+    def filter_name(self, queryset, name, value):
+        return queryset.filter(name_key__contains=search_key(value))
+
+    def filter_genre(self, queryset, name, value):
+        genre = snapshots.get(Genre).get(value)
+        if genre is None:
+            return queryset.none()
+        return queryset.filter(genre=genre.pk)
+
+    def filter_category(self, queryset, name, value):
+        category = snapshots.get(Category).get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category=category.pk)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,170 @@
+import logging
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from .plans import SerializerPlan
+
+logger = logging.getLogger(__name__)
+
+current_timings = ContextVar('current_timings', default=None)
+
+# Методы, время которых относится к этапу запроса: аутентификация,
+# проверка прав и ограничение частоты выполняются в APIView.initial,
+# права на объект - отдельно при get_object.
+TIMED_METHODS = (
+    (APIView, 'initial', 'auth'),
+    (APIView, 'check_object_permissions', 'auth'),
+    (serializers.BaseSerializer, 'is_valid', 'serializer'),
+    (serializers.ListSerializer, 'is_valid', 'serializer'),
+    (serializers.Serializer, 'data', 'serializer'),
+    (serializers.ListSerializer, 'data', 'serializer'),
+    (SerializerPlan, 'render', 'serializer'),
+)
+installed = False
+
+
+class RequestTimings:
+    """Время этапов одного запроса и число SQL-запросов.
+
+    Экземпляр подключается к соединениям как execute_wrapper и считает
+    время и число запросов к БД. Этапы могут пересекаться: запросы
+    аутентификации входят и в db, и в auth.
+    """
+
+    metrics = ('db', 'serializer', 'auth', 'total')
+
+    def __init__(self):
+        self.durations = dict.fromkeys(self.metrics, 0.0)
+        self.queries = 0
+        self.running = set()
+        self.view = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations['db'] += perf_counter() - start
+            self.queries += 1
+
+    def milliseconds(self, metric):
+        return round(self.durations[metric] * 1000, 3)
+
+    def header(self):
+        """Значение заголовка Server-Timing, длительности в мс."""
+        return ', '.join(
+            f'{metric};dur={self.milliseconds(metric)}' + (
+                f';desc="{self.queries} queries"' if metric == 'db' else ''
+            )
+            for metric in self.metrics
+        )
+
+
+def timed(metric, function):
+    """Добавляет время вызова к этапу metric текущего запроса.
+
+    Вне измеряемого запроса и во вложенных вызовах того же этапа
+    (Serializer.data вызывает BaseSerializer.data, вложенные
+    сериализаторы - методы дочерних) функция вызывается как есть.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None or metric in timings.running:
+            return function(*args, **kwargs)
+        timings.running.add(metric)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.durations[metric] += perf_counter() - start
+            timings.running.discard(metric)
+    return wrapper
+
+
+def install_timers():
+    """Один раз оборачивает методы из TIMED_METHODS."""
+    global installed
+    if installed:
+        return
+    for owner, name, metric in TIMED_METHODS:
+        attribute = owner.__dict__[name]
+        if isinstance(attribute, property):
+            attribute = property(timed(metric, attribute.fget))
+        else:
+            attribute = timed(metric, attribute)
+        setattr(owner, name, attribute)
+    installed = True
+
+
+def view_name(view_func, method):
+    """Имя представления DRF с действием: `TitleViewSet.list`."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    method = method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class ServerTimingMiddleware:
+    """Время БД, сериализаторов, проверки доступа и всего запроса.
+
+    Включается настройкой REQUEST_TIMING. Без неё middleware исключается
+    из цепочки при загрузке, а методы DRF не оборачиваются, так что
+    запросы обрабатываются без дополнительных вызовов. Измерения
+    отдаются заголовком Server-Timing и пишутся в лог `api.middleware`
+    с полями view, db_ms, db_queries, serializer_ms, auth_ms и total_ms.
+    Для потоковых ответов время считается до начала передачи тела.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        install_timers()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        timings.durations['total'] = perf_counter() - start
+        response['Server-Timing'] = timings.header()
+        logger.info(
+            '%s %s %s: %s ms, db %s ms in %s queries, serializer %s ms, '
+            'auth %s ms',
+            request.method, request.path, timings.view,
+            timings.milliseconds('total'), timings.milliseconds('db'),
+            timings.queries, timings.milliseconds('serializer'),
+            timings.milliseconds('auth'),
+            extra={
+                'view': timings.view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'db_queries': timings.queries,
+                **{
+                    f'{metric}_ms': timings.milliseconds(metric)
+                    for metric in timings.metrics
+                },
+            }
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current_timings.get().view = view_name(view_func, request.method)
@@ -1,7 +1,20 @@
-from rest_framework import filters, mixins, viewsets
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404
+from django.utils.http import http_date, parse_etags
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 
+from reviews.leaderboards import leaderboards
+from reviews.snapshots import snapshots
+from reviews.versions import get_versions
+from .filters import SearchKeyFilter
+from .pagination import KeysetPagination
 from .permissions import IsOwnerOrStaffOrReadOnly, IsAdminOrReadOnly
+from .plans import get_plan
 
 
 class CategoryGenreMixin(
@@ -10,14 +23,274 @@ class CategoryGenreMixin(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (SearchKeyFilter,)
+    search_fields = ('name_key',)
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
 
+    def get_snapshot(self):
+        return snapshots.get(self.get_queryset().model)
 
-class ReviewCommentMixin:
+    def list(self, request, *args, **kwargs):
+        search = SearchKeyFilter()
+        page = self.paginate_queryset(self.get_snapshot().serialize(
+            self.get_serializer_class(),
+            search.get_search_terms(request),
+            search.get_prefix(request)
+        ))
+        return self.get_paginated_response(page)
+
+    @action(detail=True)
+    def top(self, request, slug=None):
+        group = self.get_snapshot().get(slug)
+        if group is None:
+            raise Http404
+        return Response(leaderboards.top(group))
+
+
+class ConditionalGetMixin:
+    """ETag по счётчикам версий и Last-Modified для list и retrieve.
+
+    Версии читаются одним запросом до основного queryset: при совпадении
+    If-None-Match ответ 304 отдаётся без выборки и сериализации, после
+    проверки, что объект ответа существует - иначе версии отсутствующего
+    объекта (нулевые) совпали бы с подобранным или `*` ETag.
+    Last-Modified берётся из last_modified_field сериализуемых объектов
+    и только сообщается клиенту: дата публикации не меняется при
+    редактировании, поэтому 304 решается только по ETag.
+    """
+
+    last_modified_field = None
+
+    def get_version_keys(self):
+        raise NotImplementedError
+
+    def get_etag_versions(self):
+        return get_versions(*self.get_version_keys())
+
+    def get_etag(self):
+        return '"{}"'.format('-'.join(map(str, (
+            self.request.accepted_renderer.format, *self.get_etag_versions()
+        ))))
+
+    def get_conditional_queryset(self):
+        """Queryset, непустой, только если объект ответа существует.
+
+        Для retrieve это сам объект, для списков вложенных ресурсов
+        вьюсеты возвращают родителя; None - проверять нечего.
+        """
+        if self.action != 'retrieve':
+            return None
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def response_exists(self):
+        try:
+            queryset = self.get_conditional_queryset()
+            return queryset is None or queryset.exists()
+        except (TypeError, ValueError):
+            return False
+
+    def get_serializer(self, *args, **kwargs):
+        if args:
+            self.remember_objects(
+                args[0] if kwargs.get('many') else [args[0]]
+            )
+        return super().get_serializer(*args, **kwargs)
+
+    def remember_objects(self, objects):
+        if self.last_modified_field is None:
+            return
+        self.last_modified = max(
+            (
+                obj[self.last_modified_field] if isinstance(obj, dict)
+                else getattr(obj, self.last_modified_field)
+                for obj in objects
+            ),
+            default=None
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag()
+        tags = parse_etags(request.headers.get('If-None-Match', ''))
+        if (etag in tags or '*' in tags) and self.response_exists():
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        self.last_modified = None
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(
+                    self.last_modified.timestamp()
+                )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class SparseFieldsMixin:
+    """Параметр `?fields=` для GET: вывод только перечисленных полей.
+
+    Поля сериализатора, которые не запрошены, убираются из ответа,
+    а их колонки - из SELECT через defer(). Связи, нужные только
+    незапрошенным полям, снимаются с select_related и
+    prefetch_related, как это делает list. Колонки ключа курсора и
+    last_modified_field не откладываются: они нужны самому вьюсету.
+    """
+
+    fields_param = 'fields'
+
+    def get_requested_fields(self):
+        """Запрошенные поля в порядке сериализатора или None."""
+        if not hasattr(self, 'requested_fields'):
+            self.requested_fields = self.parse_requested_fields()
+        return self.requested_fields
+
+    def parse_requested_fields(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        names = {
+            name.strip() for name in self.request.query_params.get(
+                self.fields_param, ''
+            ).split(',')
+        } - {''}
+        if not names:
+            return None
+        available = [
+            field.field_name
+            for field in self.get_serializer_class()()._readable_fields
+        ]
+        unknown = sorted(names.difference(available))
+        if unknown:
+            raise ValidationError({self.fields_param: [
+                f'Неизвестные поля: {", ".join(unknown)}.'
+            ]})
+        return tuple(name for name in available if name in names)
+
+    def get_deferred_fields(self, fields):
+        serializer = self.get_serializer_class()()
+        model = serializer.Meta.model
+        required = {
+            name.lstrip('-')
+            for name in getattr(self, 'keyset_ordering', ())
+        }
+        required.add(getattr(self, 'last_modified_field', None))
+        deferred = []
+        for field in serializer._readable_fields:
+            if field.field_name in fields or len(field.source_attrs) != 1:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                continue
+            if (model_field.concrete and not model_field.is_relation
+                    and not model_field.primary_key
+                    and model_field.name not in required):
+                deferred.append(model_field.name)
+        return deferred
+
+    def get_unused_relations(self, fields):
+        """Атрибуты модели, которые читают только незапрошенные поля."""
+        used, unused = set(), set()
+        for field in self.get_serializer_class()()._readable_fields:
+            if field.source_attrs:
+                names = used if field.field_name in fields else unused
+                names.add(field.source_attrs[0])
+        return unused - used
+
+    def drop_relations(self, queryset, unused):
+        select = queryset.query.select_related
+        if isinstance(select, dict):
+            # select_related() без аргументов включил бы все связи.
+            kept = [name for name in select if name not in unused]
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+        lookups = queryset._prefetch_related_lookups
+        return queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in lookups
+            if getattr(lookup, 'prefetch_to', lookup).split(
+                LOOKUP_SEP
+            )[0] not in unused
+        ))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        queryset = self.drop_relations(
+            queryset, self.get_unused_relations(fields)
+        )
+        return queryset.defer(*self.get_deferred_fields(fields))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_requested_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in set(target.fields).difference(fields):
+                target.fields.pop(name)
+        return serializer
+
+
+class FastListMixin:
+    """list без ModelSerializer: строки values() и план полей.
+
+    Вывод совпадает с сериализатором вьюсета. Если план для его полей
+    не строится, используется обычный list.
+    """
+
+    last_modified_field = None
+
+    def remember_objects(self, objects):
+        """Вызывается со строками страницы перед выводом."""
+
+    def get_requested_fields(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        plan = get_plan(
+            self.get_serializer_class(), self.get_requested_fields()
+        )
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        required = [
+            name.lstrip('-')
+            for name in getattr(self, 'keyset_ordering', ())
+        ]
+        if self.last_modified_field is not None:
+            required.append(self.last_modified_field)
+        queryset = plan.values(
+            self.filter_queryset(self.get_queryset()), *required
+        )
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset if page is None else page)
+        self.remember_objects(rows)
+        data = plan.render(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class ReviewCommentMixin(
+    ConditionalGetMixin, SparseFieldsMixin, FastListMixin
+):
     permission_classes = (IsOwnerOrStaffOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
+    last_modified_field = 'pub_date'
@@ -0,0 +1,130 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """Постраничная пагинация с опциональным режимом курсора.
+
+    Без параметра `cursor` работает как PageNumberPagination. Запрос
+    с `?cursor=` (пустое значение - первая страница) переключает вьюсет
+    на поиск по ключу `keyset_ordering`: страница выбирается условием
+    WHERE по индексируемым полям без COUNT(*) и OFFSET. Другой порядок,
+    запрошенный `?ordering=` или заданный полнотекстовым поиском,
+    с курсором несовместим - на такой запрос отвечаем 400.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+    invalid_ordering_message = (
+        'Курсор поддерживает только порядок {ordering}.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.check_ordering(queryset, view)
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = [
+            (
+                queryset.model._meta.get_field(name.lstrip('-')),
+                name.startswith('-')
+            )
+            for name in view.keyset_ordering
+        ]
+        reverse, position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.seek(position, reverse))
+        queryset = queryset.order_by(*(
+            ('-' if descending != reverse else '') + field.name
+            for field, descending in self.fields
+        ))
+
+        page_size = self.get_page_size(request)
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        self.next_cursor = self.previous_cursor = None
+        if results and has_next:
+            self.next_cursor = self.encode_cursor(False, results[-1])
+        if results and has_previous:
+            self.previous_cursor = self.encode_cursor(True, results[0])
+        return results
+
+    def check_ordering(self, queryset, view):
+        """Порядок queryset должен быть пустым или совпадать с ключом."""
+        ordering = tuple(queryset.query.order_by)
+        if queryset.query.extra_order_by or (
+            ordering and ordering != tuple(view.keyset_ordering)
+        ):
+            raise exceptions.ValidationError({
+                self.cursor_query_param: self.invalid_ordering_message.format(
+                    ordering=','.join(view.keyset_ordering)
+                )
+            })
+
+    def seek(self, position, reverse):
+        """Условие «строго после позиции» для составного ключа."""
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(self.fields, position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field.attname}__{lookup}': value})
+            equal[field.attname] = value
+        return condition
+
+    def encode_cursor(self, reverse, obj):
+        if isinstance(obj, dict):
+            # Строка values() вместо экземпляра модели.
+            obj = SimpleNamespace(**obj)
+        position = [field.value_to_string(obj) for field, _ in self.fields]
+        token = json.dumps([reverse, position], separators=(',', ':'))
+        return urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return False, None
+        try:
+            token = urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            reverse, position = json.loads(token)
+            if len(position) != len(self.fields):
+                raise ValueError
+            return bool(reverse), [
+                field.to_python(value)
+                for (field, _), value in zip(self.fields, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_cursor_link(self.next_cursor)),
+            ('previous', self.get_cursor_link(self.previous_cursor)),
+            ('results', data)
+        ]))
@@ -0,0 +1,157 @@
+from rest_framework import serializers
+
+from reviews.snapshots import snapshots
+from .fields import SnapshotNestedField
+
+
+class UnsupportedField(Exception):
+    """Поле сериализатора нельзя вывести из строки values()."""
+
+
+class SerializerPlan:
+    """Скомпилированный план вывода сериализатора только для чтения.
+
+    Поля сериализатора один раз разбираются на колонки values() и
+    функции преобразования - to_representation того же поля DRF, поэтому
+    значения выводятся так же, как у сериализатора. Строки выборки
+    превращаются в словари без создания экземпляров моделей и без
+    обхода полей DRF на каждый объект.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        self.lookups = ['pk']
+        self.steps = []
+        self.nested = []
+        for field in serializer._readable_fields:
+            if fields is None or field.field_name in fields:
+                self.compile_field(field)
+
+    def compile_field(self, field):
+        name = field.field_name
+        path = '__'.join(field.source_attrs)
+        if isinstance(field, SnapshotNestedField):
+            model_field = self.model._meta.get_field(path)
+            if field.many:
+                self.nested.append((name, model_field, field))
+                self.steps.append((name, None, None))
+            else:
+                self.add_step(name, model_field.attname, None)
+                self.nested.append((name, model_field, field))
+        elif isinstance(field, serializers.SlugRelatedField):
+            self.add_step(name, f'{path}__{field.slug_field}', None)
+        elif isinstance(field, (
+            serializers.BaseSerializer,
+            serializers.ManyRelatedField,
+            serializers.RelatedField,
+            serializers.SerializerMethodField
+        )):
+            raise UnsupportedField(name)
+        else:
+            model_field = self.model._meta.get_field(path)
+            if model_field.is_relation:
+                raise UnsupportedField(name)
+            self.add_step(name, model_field.attname, field.to_representation)
+
+    def add_step(self, name, lookup, convert):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        self.steps.append((name, lookup, convert))
+
+    def values(self, queryset, *lookups):
+        """Queryset строк с колонками плана, lookups и extra(select)."""
+        return queryset.prefetch_related(None).values(*dict.fromkeys((
+            *self.lookups, *lookups, *queryset.query.extra_select
+        )))
+
+    def render(self, rows):
+        rows = list(rows)
+        representations = {
+            name: self.represent_nested(rows, model_field, field)
+            for name, model_field, field in self.nested
+        }
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert in self.steps:
+                if name in representations:
+                    item[name] = representations[name].get(
+                        row['pk'] if lookup is None else row[lookup]
+                    )
+                    continue
+                value = row[lookup]
+                item[name] = (
+                    value if value is None or convert is None
+                    else convert(value)
+                )
+            data.append(item)
+        return data
+
+    def represent_nested(self, rows, model_field, field):
+        """Представления связанных объектов страницы по id строки.
+
+        Для связи многие-ко-многим id связанных объектов читаются одним
+        запросом к промежуточной таблице и упорядочиваются как в снимке,
+        то есть как при prefetch_related по умолчанию.
+        """
+        model = model_field.related_model
+        snapshot = snapshots.get(model)
+        if field.many:
+            through = model_field.remote_field.through
+            source = f'{model_field.m2m_field_name()}_id'
+            target = f'{model_field.m2m_reverse_field_name()}_id'
+            links = through.objects.filter(**{
+                f'{source}__in': [row['pk'] for row in rows]
+            }).values_list(source, target)
+            order = {pk: position for position, pk in enumerate(
+                snapshot.by_id
+            )}
+            related = {}
+            for row_pk, pk in sorted(
+                links, key=lambda link: order.get(link[1], len(order))
+            ):
+                related.setdefault(row_pk, []).append(pk)
+        else:
+            related = {
+                row[model_field.attname]: row[model_field.attname]
+                for row in rows if row[model_field.attname] is not None
+            }
+        ids = {
+            pk for pks in related.values()
+            for pk in (pks if field.many else [pks])
+        }
+        represented = {
+            pk: snapshot.represent(field.serializer_class, pk) for pk in ids
+        }
+        missing = [pk for pk, data in represented.items() if data is None]
+        if missing:
+            represented.update(
+                (obj.pk, field.serializer_class(obj).data)
+                for obj in model.objects.filter(pk__in=missing)
+            )
+        if field.many:
+            return {
+                row['pk']: [
+                    represented[pk] for pk in related.get(row['pk'], [])
+                ]
+                for row in rows
+            }
+        return {pk: represented[pk] for pk in related}
+
+
+plans = {}
+
+
+def get_plan(serializer_class, fields=None):
+    """План вывода сериализатора или None, если его поля не поддержаны.
+
+    fields - кортеж имён полей для вывода, None - все поля.
+    """
+    key = serializer_class, fields
+    if key not in plans:
+        try:
+            plans[key] = SerializerPlan(serializer_class, fields)
+        except UnsupportedField:
+            plans[key] = None
+    return plans[key]
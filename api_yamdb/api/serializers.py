@@ -3,18 +3,27 @@ from datetime import datetime
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
-from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.constants import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+    MAX_SCORE,
+    MIN_SCORE,
+    NAME_LENGTH
+)
 from reviews.models import (
     Category,
     Genre,
+    GenreTitle,
     Title,
     Comment,
     Review
 )
 from users.constants import USERNAME_LENGTH
+from .fields import SnapshotNestedField, SnapshotSlugRelatedField
 from .utils import get_object_by_pk
 
 User = get_user_model()
@@ -46,31 +55,50 @@ class TitleBase(serializers.ModelSerializer):
 
 
 class TitleReadSerializer(TitleBase):
-    category = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='slug',
-    )
-    genre = GenreSerializer(many=True)
+    category = SnapshotNestedField(CategorySerializer)
+    genre = SnapshotNestedField(GenreSerializer, many=True)
 
 
 class TitleCreateSerializer(TitleBase):
-    category = serializers.SlugRelatedField(
+    category = SnapshotSlugRelatedField(
         slug_field='slug', queryset=Category.objects.all())
-    genre = serializers.SlugRelatedField(
+    genre = SnapshotSlugRelatedField(
         slug_field='slug', queryset=Genre.objects.all(), many=True)
     description = serializers.CharField(required=False)
-    rating = serializers.IntegerField(required=False, allow_null=True)
 
     def to_representation(self, instance):
-        ret = super().to_representation(instance)
-        ret['genre'] = GenreSerializer(
-            Genre.objects.filter(slug__in=ret['genre']),
-            many=True
-        ).data
-        ret['category'] = CategorySerializer(
-            Category.objects.get(slug=ret['category'])
-        ).data
-        return ret
+        return TitleReadSerializer(instance, context=self.context).data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = Title.objects.create(**validated_data)
+        self.set_genres(title, genres)
+        return title
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        instance = super().update(instance, validated_data)
+        if genres is not None:
+            GenreTitle.objects.filter(title=instance).delete()
+            self.set_genres(instance, genres)
+        return instance
+
+    @staticmethod
+    def set_genres(title, genres):
+        """Записывает жанры и кладёт их в кэш prefetch_related."""
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre) for genre in genres
+        )
+        prefetched = title.genre.all()
+        prefetched._result_cache = sorted(
+            genres, key=lambda genre: genre.name
+        )
+        prefetched._prefetch_done = True
+        if not hasattr(title, '_prefetched_objects_cache'):
+            title._prefetched_objects_cache = {}
+        title._prefetched_objects_cache['genre'] = prefetched
 
     def validate_year(self, value):
         current_year = datetime.now().year
@@ -132,6 +160,14 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'pub_date', 'author')
 
 
+class AutocompleteSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=NAME_LENGTH)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=AUTOCOMPLETE_MAX_LIMIT,
+        default=AUTOCOMPLETE_LIMIT
+    )
+
+
 class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
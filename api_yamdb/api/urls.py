@@ -4,10 +4,12 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CategoryViewSet,
     CommentViewSet,
+    ExportView,
     GenreViewSet,
     TitleViewSet,
     ReviewViewSet,
     UserViewSet,
+    autocomplete_view,
     user_signup_view,
     obtain_token_view
 )
@@ -34,5 +36,11 @@ api_v1 = [
 urlpatterns = [
     path("v1/auth/signup/", user_signup_view, name="signup"),
     path('v1/auth/token/', obtain_token_view, name='token'),
+    path('v1/autocomplete/', autocomplete_view, name='autocomplete'),
+    path(
+        'v1/export/<slug:dataset>.<slug:export_format>',
+        ExportView.as_view(),
+        name='export'
+    ),
     path('v1/', include(api_v1)),
 ]
@@ -1,19 +1,45 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Review, Title
-from .filters import TitleFilter
-from .mixins import CategoryGenreMixin, ReviewCommentMixin
+from reviews.autocomplete import autocomplete
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import get_score_distribution
+from reviews.snapshots import snapshots
+from reviews.versions import (
+    TITLES,
+    USERS,
+    comment_key,
+    review_comments_key,
+    review_key,
+    title_key,
+    title_reviews_key
+)
+from .exports import (
+    EXPORTS,
+    FORMATS,
+    ExportContentNegotiation,
+    export_response
+)
+from .filters import SearchKeyFilter, StableOrderingFilter, TitleFilter
+from .mixins import (
+    CategoryGenreMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ReviewCommentMixin,
+    SparseFieldsMixin
+)
+from .pagination import KeysetPagination
 from .permissions import IsAdminOrReadOnly, IsAdmin
 from .serializers import (
+    AutocompleteSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
@@ -43,24 +69,52 @@ class CategoryViewSet(CategoryGenreMixin):
     serializer_class = CategorySerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.order_by('id').annotate(
-        rating=Avg('reviews__score')
-    )
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [
+        SearchKeyFilter, DjangoFilterBackend, StableOrderingFilter
+    ]
+    search_fields = ('name_key',)
     filterset_class = TitleFilter
-    pagination_class = PageNumberPagination
+    ordering_fields = ('name', 'year', 'rating', 'review_count')
+    pagination_class = KeysetPagination
+    keyset_ordering = ('name', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
     ordering = ('name', 'id')
 
     def get_serializer_class(self):
-        if self.action == 'get':
+        if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleCreateSerializer
 
+    def get_version_keys(self):
+        if self.action == 'retrieve':
+            return (title_key(self.kwargs['pk']),)
+        return (TITLES,)
+
+    def get_etag_versions(self):
+        # Категории и жанры в ответе берутся из снимка, поэтому в ETag
+        # его версия, а не текущий GROUPS: иначе до сверки снимка
+        # устаревшее тело ушло бы под новым ETag.
+        return [*super().get_etag_versions(), snapshots.check()]
+
+    @action(detail=True, url_path='score-distribution')
+    def score_distribution(self, request, pk=None):
+        title = get_object_by_pk(
+            Title.objects.only('pk'), self.kwargs, pk='pk'
+        )
+        return Response(get_score_distribution(title.pk))
+
 
 class ReviewViewSet(ReviewCommentMixin, viewsets.ModelViewSet):
     """Вьюсет для отзывов."""
@@ -71,7 +125,19 @@ class ReviewViewSet(ReviewCommentMixin, viewsets.ModelViewSet):
         return get_object_by_pk(Title, self.kwargs, pk='title_id')
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
+
+    def get_version_keys(self):
+        if self.action == 'retrieve':
+            return review_key(self.kwargs['pk']), USERS
+        return title_reviews_key(self.kwargs['title_id']), USERS
+
+    def get_conditional_queryset(self):
+        if self.action == 'retrieve':
+            return Review.objects.filter(
+                pk=self.kwargs['pk'], title_id=self.kwargs['title_id']
+            )
+        return Title.objects.filter(pk=self.kwargs['title_id'])
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
@@ -88,12 +154,51 @@ class CommentViewSet(ReviewCommentMixin, viewsets.ModelViewSet):
         )
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
+
+    def get_version_keys(self):
+        if self.action == 'retrieve':
+            return comment_key(self.kwargs['pk']), USERS
+        return review_comments_key(self.kwargs['review_id']), USERS
+
+    def get_conditional_queryset(self):
+        if self.action == 'retrieve':
+            return Comment.objects.filter(
+                pk=self.kwargs['pk'],
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id']
+            )
+        return Review.objects.filter(
+            pk=self.kwargs['review_id'], title_id=self.kwargs['title_id']
+        )
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_view(request):
+    serializer = AutocompleteSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return Response(autocomplete.search(
+        serializer.validated_data['q'],
+        serializer.validated_data['limit']
+    ))
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка произведений или отзывов целиком."""
+
+    permission_classes = (IsAdmin,)
+    content_negotiation_class = ExportContentNegotiation
+
+    def get(self, request, dataset, export_format):
+        if dataset not in EXPORTS or export_format not in FORMATS:
+            raise Http404
+        return export_response(request, dataset, export_format)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def user_signup_view(request):
@@ -121,16 +226,17 @@ def obtain_token_view(request):
     return Response({'token': str(access_token)})
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdmin]
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
+    keyset_ordering = ('id',)
     lookup_field = 'username'
     http_method_names = ['get', 'post', 'patch', 'delete']
     lookup_value_regex = r'[\w/./@/+/-]+'
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('username',)
+    filter_backends = (SearchKeyFilter,)
+    search_fields = ('username_key',)
 
     @action(
         methods=['GET', 'PATCH'],
@@ -36,6 +36,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -130,6 +131,16 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
 
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
 }
 
 
@@ -139,6 +150,13 @@ SIMPLE_JWT = {
 }
 
 
+# Request Timing
+
+# Заголовок Server-Timing и лог времени БД, сериализаторов и проверки
+# доступа для каждого запроса, см. api.middleware.ServerTimingMiddleware.
+REQUEST_TIMING = False
+
+
 # Email Backend
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
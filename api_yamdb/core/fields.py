@@ -0,0 +1,49 @@
+import unicodedata
+
+from django.db import models
+
+# Верхняя граница для поиска по префиксу: больше любого символа Unicode.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def search_key(value):
+    """Приводит строку к виду для регистронезависимого поиска.
+
+    Встроенные в SQLite LIKE и lower() учитывают регистр только
+    для ASCII, поэтому кириллица сравнивается по заранее приведённому
+    ключу: NFKC-нормализация, casefold и замена «ё» на «е».
+    """
+    return unicodedata.normalize('NFKC', value).casefold().replace('ё', 'е')
+
+
+class SearchKeyField(models.CharField):
+    """Индексируемая копия поля `source`, приведённая через search_key.
+
+    Значение вычисляется в pre_save, поэтому обновляется и при save(),
+    и при bulk_create(). При bulk_update() и update() ключ нужно
+    передавать явно.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        for option, default in (('editable', False), ('db_index', True)):
+            kwargs.pop(option, None)
+            if getattr(self, option) != default:
+                kwargs[option] = getattr(self, option)
+        return name, path, args, kwargs
+
+    def make_key(self, model_instance):
+        value = getattr(model_instance, self.source) or ''
+        return search_key(value)[:self.max_length]
+
+    def pre_save(self, model_instance, add):
+        value = self.make_key(model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
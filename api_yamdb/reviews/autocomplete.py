@@ -0,0 +1,155 @@
+from bisect import bisect_left, bisect_right
+from threading import RLock
+from time import monotonic
+
+from core.fields import PREFIX_UPPER_BOUND, search_key
+from .constants import SNAPSHOT_CHECK_INTERVAL
+from .models import Category, Genre, Title
+from .versions import NAMES, get_versions
+
+
+class PrefixIndex:
+    """Отсортированный по ключу поиска список имён для поиска по префиксу.
+
+    Вместо узлов дерева хранит два параллельных списка - ключи и id,
+    отсортированные по ключу: все имена с общим префиксом лежат подряд,
+    поэтому поиск - это два bisect и срез, O(log n + limit).
+    """
+
+    def __init__(self, entries=()):
+        entries = sorted(
+            (search_key(name), pk, data) for pk, name, data in entries
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.ids = [pk for _, pk, _ in entries]
+        self.items = {pk: (key, data) for key, pk, data in entries}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, pk, name, data):
+        self.remove(pk)
+        key = search_key(name)
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.ids.insert(position, pk)
+        self.items[pk] = (key, data)
+
+    def remove(self, pk):
+        if pk not in self.items:
+            return
+        key, _ = self.items.pop(pk)
+        position = self.ids.index(
+            pk,
+            bisect_left(self.keys, key),
+            bisect_right(self.keys, key)
+        )
+        del self.keys[position]
+        del self.ids[position]
+
+    def search(self, prefix, limit):
+        key = search_key(prefix)
+        start = bisect_left(self.keys, key)
+        stop = min(
+            bisect_left(self.keys, key + PREFIX_UPPER_BOUND, lo=start),
+            start + limit
+        )
+        return [self.items[pk][1] for pk in self.ids[start:stop]]
+
+
+class Autocomplete:
+    """Индексы автодополнения для произведений, жанров и категорий.
+
+    Индексы строятся из БД при первом запросе и дальше обновляются
+    сигналами моделей. Каждый процесс держит свою копию, помеченную
+    версией NAMES: как и снимки групп, она сверяет её не чаще раза в
+    `check_interval` секунд и перестраивается, если произведения,
+    жанры или категории изменил другой процесс. Отзывы и рейтинги
+    NAMES не меняют, поэтому индекс не перестраивается после них.
+    """
+
+    sources = {
+        'titles': (Title, ('id', 'name', 'year')),
+        'genres': (Genre, ('name', 'slug')),
+        'categories': (Category, ('name', 'slug')),
+    }
+
+    def __init__(self, check_interval=SNAPSHOT_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.lock = RLock()
+        self.reset()
+
+    @staticmethod
+    def make_entry(obj, fields):
+        data = {field: getattr(obj, field) for field in fields}
+        return obj.pk, obj.name, data
+
+    def load(self):
+        with self.lock:
+            now = monotonic()
+            if (self.checked_at is None
+                    or now - self.checked_at > self.check_interval):
+                version, = get_versions(NAMES)
+                self.checked_at = now
+                if version != self.version:
+                    self.version = version
+                    self.indexes = None
+            if self.indexes is None:
+                self.indexes = {
+                    kind: PrefixIndex(
+                        self.make_entry(obj, fields)
+                        for obj in model.objects.only(
+                            'pk', *fields
+                        ).order_by().iterator()
+                    )
+                    for kind, (model, fields) in self.sources.items()
+                }
+            return self.indexes
+
+    def search(self, prefix, limit):
+        indexes = self.load()
+        with self.lock:
+            return {
+                kind: index.search(prefix, limit)
+                for kind, index in indexes.items()
+            }
+
+    def get_kind(self, model):
+        for kind, (source, fields) in self.sources.items():
+            if source is model:
+                return kind, fields
+        return None, None
+
+    def follow_version(self):
+        """Принимает версию NAMES, сдвинутую своей записью.
+
+        Запись, уже внесённая в индекс, сдвигает NAMES на единицу.
+        Если версия ушла дальше, писал и другой процесс, и индекс
+        перестроится при следующей сверке.
+        """
+        version, = get_versions(NAMES)
+        if self.version is not None and version == self.version + 1:
+            self.version = version
+
+    def update(self, obj):
+        kind, fields = self.get_kind(type(obj))
+        with self.lock:
+            if kind is not None and self.indexes is not None:
+                self.indexes[kind].add(*self.make_entry(obj, fields))
+                self.follow_version()
+
+    def remove(self, model, pk):
+        kind, _ = self.get_kind(model)
+        with self.lock:
+            if kind is not None and self.indexes is not None:
+                self.indexes[kind].remove(pk)
+                self.follow_version()
+
+    def reset(self):
+        with self.lock:
+            self.indexes = None
+            self.version = None
+            self.checked_at = None
+
+
+autocomplete = Autocomplete()
@@ -2,3 +2,20 @@ NAME_LENGTH = 256
 SLUG_LENGTH = 50
 MIN_SCORE = 1
 MAX_SCORE = 10
+SCORE_PERCENTILES = (10, 25, 75, 90)
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+LEADERBOARD_SIZE = 20
+LEADERBOARD_TTL = 60
+SNAPSHOT_CHECK_INTERVAL = 1
+EXPORT_CHUNK_SIZE = 1000
+LOAD_BATCH_SIZE = 5000
+LOAD_WORKERS = 4
+GENERATE_USERS = 10000
+GENERATE_CATEGORIES = 10
+GENERATE_GENRES = 30
+GENERATE_TITLES = 10000
+GENERATE_REVIEWS = 100000
+GENERATE_COMMENTS = 50000
+GENERATE_GENRES_PER_TITLE = 3
+GENERATE_ZIPF_EXPONENT = 1.0
@@ -0,0 +1,242 @@
+import random
+from datetime import timedelta
+from itertools import chain, islice
+from time import monotonic
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.fields import search_key
+from .constants import LOAD_BATCH_SIZE, MAX_SCORE, MIN_SCORE
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+ADJECTIVES = (
+    'Тёмная', 'Последняя', 'Белая', 'Тихая', 'Далёкая', 'Новая', 'Старая',
+    'Золотая', 'Холодная', 'Вечная', 'Забытая', 'Красная',
+)
+NOUNS = (
+    'звезда', 'река', 'дорога', 'ночь', 'война', 'песня', 'история',
+    'земля', 'зима', 'комната', 'гавань', 'буря',
+)
+WORDS = (
+    'сюжет', 'герой', 'финал', 'атмосфера', 'музыка', 'актёры', 'автор',
+    'сцена', 'ритм', 'идея', 'язык', 'образ', 'смысл', 'темп', 'диалоги',
+)
+# Даты отзывов и комментариев - за последние пять лет.
+DATES_SPAN = timedelta(days=5 * 365)
+
+
+def zipf_counts(total, size, exponent, cap):
+    """Раскладывает total отзывов на size произведений по закону Ципфа.
+
+    Произведение ранга r получает долю, пропорциональную
+    1 / r ** exponent, но не больше cap отзывов - столько есть разных
+    авторов. Остаток от округления и ограничения достаётся
+    произведениям с начала рейтинга.
+    """
+    if total > size * cap:
+        raise ValueError(
+            f'{total} reviews do not fit {size} titles '
+            f'with {cap} authors each.'
+        )
+    if not total:
+        return [0] * size
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+    left = total - sum(counts)
+    for index in range(size):
+        if not left:
+            break
+        extra = min(cap - counts[index], left)
+        counts[index] += extra
+        left -= extra
+    return counts
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+class DataGenerator:
+    """Синтетический набор данных заданного объёма.
+
+    Строки создаются с явными id после существующих, поэтому связи
+    ссылаются на них без чтения БД. Все случайные величины берутся из
+    random.Random(seed), а даты и годы отсчитываются от now (по
+    умолчанию - момент запуска): одинаковые seed и now дают одинаковые
+    строки.
+    """
+
+    def __init__(self, seed=None, batch_size=LOAD_BATCH_SIZE, progress=None,
+                 now=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress
+        self.now = timezone.now() if now is None else now
+        self.adapt_date = connection.ops.adapt_datetimefield_value
+
+    def insert(self, model, rows):
+        """Вставляет словари значений порциями, одна транзакция на порцию.
+
+        Строки уходят в executemany готовыми значениями для БД, минуя
+        создание моделей и компилятор bulk_create - на десятках
+        миллионов строк это основное время. Поля, которых нет в строках,
+        получают значения по умолчанию модели.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        fields = [model._meta.get_field(name) for name in first] + [
+            field for field in model._meta.concrete_fields
+            if field.attname not in first
+        ]
+        defaults = [
+            field.get_db_prep_save(field.get_default(), connection)
+            for field in fields[len(first):]
+        ]
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields))
+        )
+        rows = chain([first], rows)
+        count = 0
+        start = monotonic()
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return count
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(
+                    sql, [[*row.values(), *defaults] for row in batch]
+                )
+            count += len(batch)
+            if self.progress is not None:
+                self.progress(model, count, monotonic() - start)
+
+    def text(self, words):
+        return ' '.join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def date(self):
+        return self.adapt_date(self.now - DATES_SPAN * self.random.random())
+
+    def users(self, first, count):
+        for pk in range(first, first + count):
+            yield {
+                'id': pk,
+                'username': f'user{pk}',
+                'username_key': f'user{pk}',
+                'email': f'user{pk}@yamdb.fake',
+            }
+
+    def groups(self, model, first, count, name):
+        for pk in range(first, first + count):
+            yield {
+                'id': pk,
+                'name': f'{name} {pk}',
+                'name_key': search_key(f'{name} {pk}'),
+                'slug': f'{model._meta.model_name}-{pk}',
+            }
+
+    def titles(self, first, count, categories):
+        for pk in range(first, first + count):
+            name = (
+                f'{self.random.choice(ADJECTIVES)} '
+                f'{self.random.choice(NOUNS)} {pk}'
+            )
+            yield {
+                'id': pk,
+                'name': name,
+                'name_key': search_key(name),
+                'year': self.random.randint(1900, self.now.year),
+                'description': self.text(self.random.randint(0, 30)),
+                'category_id': (
+                    self.random.choice(categories) if categories else None
+                ),
+            }
+
+    def genre_titles(self, titles, genres, per_title):
+        pk = next_id(GenreTitle)
+        for title_id in titles:
+            for genre_id in self.random.sample(
+                genres, self.random.randint(1, min(per_title, len(genres)))
+            ):
+                yield {'id': pk, 'title_id': title_id, 'genre_id': genre_id}
+                pk += 1
+
+    def reviews(self, first, titles, users, counts):
+        """Отзывы: у каждого произведения - count разных авторов.
+
+        Оценки группируются вокруг случайного «качества» произведения.
+        """
+        pk = first
+        order = list(titles)
+        self.random.shuffle(order)
+        for title_id, count in zip(order, counts):
+            quality = self.random.uniform(MIN_SCORE + 2, MAX_SCORE - 1)
+            for author_id in self.random.sample(users, count):
+                score = round(self.random.gauss(quality, 1.5))
+                yield {
+                    'id': pk,
+                    'title_id': title_id,
+                    'author_id': author_id,
+                    'text': self.text(self.random.randint(3, 40)),
+                    'score': min(MAX_SCORE, max(MIN_SCORE, score)),
+                    'pub_date': self.date(),
+                }
+                pk += 1
+
+    def comments(self, count, reviews, users):
+        first = next_id(Comment)
+        for pk in range(first, first + count):
+            yield {
+                'id': pk,
+                'review_id': self.random.choice(reviews),
+                'author_id': self.random.choice(users),
+                'text': self.text(self.random.randint(2, 20)),
+                'pub_date': self.date(),
+            }
+
+    def generate(
+        self, users, categories, genres, titles, reviews, comments,
+        genres_per_title, exponent
+    ):
+        """Создаёт данные и возвращает модели, в которые они записаны."""
+        first = {
+            model: next_id(model)
+            for model in (User, Category, Genre, Title, Review)
+        }
+        user_ids = range(first[User], first[User] + users)
+        category_ids = range(first[Category], first[Category] + categories)
+        genre_ids = range(first[Genre], first[Genre] + genres)
+        title_ids = range(first[Title], first[Title] + titles)
+        review_ids = range(first[Review], first[Review] + reviews)
+        counts = zipf_counts(reviews, titles, exponent, users)
+        if comments and not (reviews and users):
+            raise ValueError('Comments need reviews and users.')
+        self.insert(User, self.users(first[User], users))
+        self.insert(Category, self.groups(
+            Category, first[Category], categories, 'Категория'
+        ))
+        self.insert(Genre, self.groups(
+            Genre, first[Genre], genres, 'Жанр'
+        ))
+        self.insert(Title, self.titles(
+            first[Title], titles, category_ids
+        ))
+        if genres:
+            self.insert(GenreTitle, self.genre_titles(
+                title_ids, genre_ids, genres_per_title
+            ))
+        self.insert(Review, self.reviews(
+            first[Review], title_ids, user_ids, counts
+        ))
+        self.insert(Comment, self.comments(comments, review_ids, user_ids))
+        return User, Category, Genre, Title, GenreTitle, Review, Comment
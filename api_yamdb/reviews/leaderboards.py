@@ -0,0 +1,129 @@
+import heapq
+from threading import RLock
+from time import monotonic
+
+from .constants import LEADERBOARD_SIZE, LEADERBOARD_TTL
+from .models import Category, Genre, GenreTitle, Title
+
+LEADERBOARD_FIELDS = ('id', 'name', 'year', 'rating', 'review_count')
+
+
+class Board:
+    """Ограниченная куча лучших по рейтингу произведений одной группы.
+
+    В вершине min-кучи лежит худшее из лучших произведений, поэтому
+    новое произведение сравнивается только с ним. Если в группе меньше
+    `size` произведений с рейтингом, доска полная (complete) - в ней
+    все произведения группы, иначе все остальные не лучше вершины.
+    """
+
+    def __init__(self, rows, size):
+        self.size = size
+        self.heap = [self.make_item(row) for row in rows]
+        heapq.heapify(self.heap)
+        self.complete = len(self.heap) < size
+        self.loaded_at = monotonic()
+
+    @staticmethod
+    def make_item(row):
+        # При равном рейтинге выше произведение с меньшим id.
+        return row['rating'], -row['id'], row
+
+    def top(self):
+        return [row for _, _, row in sorted(self.heap, reverse=True)]
+
+    def update(self, title_id, row=None):
+        """Заменяет произведение на доске новой строкой.
+
+        row=None - произведение без рейтинга или вне группы. Возвращает
+        False, если после изменения доску нельзя восстановить без
+        чтения БД: произведение опустилось, а на его место может
+        претендовать произведение, которого на доске нет.
+        """
+        item = None if row is None else self.make_item(row)
+        kept = [entry for entry in self.heap if entry[2]['id'] != title_id]
+        if len(kept) < len(self.heap) and not self.complete:
+            # Сравниваются только ключи: у вершины с прежним рейтингом
+            # они совпадают, а словари строк несравнимы.
+            if item is None or item[:2] < self.heap[0][:2]:
+                return False
+        if len(kept) < len(self.heap):
+            heapq.heapify(kept)
+            self.heap = kept
+        if item is not None:
+            heapq.heappush(self.heap, item)
+            if len(self.heap) > self.size:
+                heapq.heappop(self.heap)
+                self.complete = False
+        return True
+
+
+class Leaderboards:
+    """Лучшие по рейтингу произведения каждой категории и жанра.
+
+    Доска строится из таблицы произведений при первом запросе, дальше
+    обновляется сигналами отзывов и произведений и таблицу отзывов не
+    читает. Каждый процесс держит свои доски; изменения из других
+    процессов видны после перестроения доски раз в `ttl` секунд.
+    """
+
+    groups = {
+        Category: 'category',
+        Genre: 'genre',
+    }
+
+    def __init__(self, size=LEADERBOARD_SIZE, ttl=LEADERBOARD_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.lock = RLock()
+        self.boards = {}
+
+    def load(self, model, pk):
+        rows = Title.objects.filter(
+            **{self.groups[model]: pk}, rating__isnull=False
+        ).order_by('-rating', 'id').values(*LEADERBOARD_FIELDS)
+        return Board(rows[:self.size], self.size)
+
+    def top(self, group):
+        key = type(group), group.pk
+        with self.lock:
+            board = self.boards.get(key)
+            if board is None or monotonic() - board.loaded_at > self.ttl:
+                board = self.boards[key] = self.load(*key)
+            return board.top()
+
+    def update_title(self, title_id):
+        with self.lock:
+            if not self.boards:
+                return
+        row = Title.objects.filter(pk=title_id).values(
+            *LEADERBOARD_FIELDS, 'category_id'
+        ).first()
+        keys = set()
+        if row is not None:
+            keys.add((Category, row.pop('category_id')))
+            keys.update(
+                (Genre, genre_id)
+                for genre_id in GenreTitle.objects.filter(
+                    title_id=title_id
+                ).values_list('genre_id', flat=True)
+            )
+            if row['rating'] is None:
+                row = None
+        with self.lock:
+            for key, board in list(self.boards.items()):
+                if not board.update(
+                    title_id, row if key in keys else None
+                ):
+                    del self.boards[key]
+
+    def remove_group(self, model, pk):
+        with self.lock:
+            self.boards.pop((model, pk), None)
+
+    def reset(self):
+        with self.lock:
+            self.boards = {}
+
+
+leaderboards = Leaderboards()
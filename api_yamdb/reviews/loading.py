@@ -0,0 +1,362 @@
+import csv
+import hashlib
+import os
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from graphlib import TopologicalSorter
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from core.fields import SearchKeyField
+from .autocomplete import autocomplete
+from .leaderboards import leaderboards
+from .models import LoadCheckpoint, Review
+from .ratings import recount_score_counts, recount_titles_score
+from .snapshots import snapshots
+from .versions import GROUPS, NAMES, TITLES, USERS, bump_versions
+
+LOOKUP_APP_NAME = 'reviews'
+# Файлы полного набора данных, как в static/data.
+DATASET_FILES = (
+    'users', 'category', 'genre', 'titles', 'genre_title', 'review',
+    'comments'
+)
+# Колонки пользователей - как в static/data/users.csv: пароли, права
+# и даты входа в выгрузку не попадают.
+USER_COLUMNS = (
+    'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+)
+
+
+def get_model_by_name(name):
+    """Модель по имени CSV-файла: users, titles, genre_title и т.п.
+
+    Если модели нет, выбрасывает LookupError.
+    """
+    name = name.replace('_', '')
+    if 'user' in name:
+        return get_user_model()
+    for check_name in [name, name[:-1]]:
+        # Try plural and single spelling
+        try:
+            return apps.get_model(
+                app_label=LOOKUP_APP_NAME, model_name=check_name
+            )
+        except LookupError:
+            pass
+    raise LookupError(name)
+
+
+def dependency_order(models):
+    """Группы моделей в порядке зависимостей по внешним ключам.
+
+    Модели группы зависят только от моделей предыдущих групп, поэтому
+    их можно загружать одновременно. Ссылки на модели вне списка и на
+    саму модель не учитываются.
+    """
+    sorter = TopologicalSorter()
+    for model in models:
+        sorter.add(model, *(
+            field.related_model for field in model._meta.concrete_fields
+            if field.many_to_one or field.one_to_one
+            if field.related_model in models
+            and field.related_model is not model
+        ))
+    sorter.prepare()
+    groups = []
+    while sorter.is_active():
+        group = sorter.get_ready()
+        groups.append(list(group))
+        sorter.done(*group)
+    return groups
+
+
+@contextmanager
+def deferred_indexes(models):
+    """Удаляет индексы Meta.indexes на время загрузки и создаёт заново.
+
+    Индексы уникальности остаются: на них опирается пропуск уже
+    загруженных строк.
+    """
+    indexes = [
+        (model, index) for model in models for index in model._meta.indexes
+    ]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+def create_with_dates(model, objs):
+    """bulk_create с датами auto_now_add из CSV, а не временем загрузки.
+
+    pre_save таких полей при вставке подставляет текущее время, поэтому
+    даты из CSV записываются следом через bulk_update. Он трогает
+    только строки, вставленные здесь же: строки, пропущенные по
+    ignore_conflicts, старше начала вставки. Если в строке CSV даты
+    нет, остаётся время загрузки.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    dates = [
+        (obj, [getattr(obj, field.attname) for field in fields])
+        for obj in objs
+    ]
+    started = timezone.now()
+    model.objects.bulk_create(objs, ignore_conflicts=True)
+    for number, field in enumerate(fields):
+        dated = []
+        for obj, values in dates:
+            if values[number] is not None and obj.pk is not None:
+                setattr(obj, field.attname, values[number])
+                dated.append(obj)
+        if dated:
+            model.objects.filter(
+                **{f'{field.attname}__gte': started}
+            ).bulk_update(dated, [field.attname])
+
+
+def analyze():
+    """Обновляет статистику планировщика после массовой загрузки."""
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+def read_batches(file, batch_size, skip=0):
+    """Читает CSV порциями словарей, не загружая файл в память целиком.
+
+    skip - сколько первых строк данных пропустить.
+    """
+    reader = csv.DictReader(file)
+    deque(islice(reader, skip), maxlen=0)
+    while True:
+        batch = list(islice(reader, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_insert(model, rows):
+    """Вставляет порцию строк одной транзакцией.
+
+    Строки, нарушающие уникальность (например, уже загруженные с тем же
+    id), пропускаются, как при get_or_create. Даты берутся из CSV.
+    Сигналы post_save при этом не отправляются - после загрузки нужен
+    finish_bulk_load.
+    """
+    with transaction.atomic():
+        create_with_dates(
+            model, [model(**parse_row(model, row)) for row in rows]
+        )
+
+
+def csv_columns(model):
+    """Колонки CSV модели в формате load_csv: связи - колонками `_id`.
+
+    Вычисляемые поля (ключи поиска, счётчики оценок) не выгружаются,
+    их восстанавливает загрузка. У пользователей - только USER_COLUMNS.
+    """
+    if model is get_user_model():
+        return list(USER_COLUMNS)
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.editable or field.primary_key
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+def format_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def dump_rows(model, file, chunk_size, start=None, stop=None):
+    """Пишет строки модели с pk из [start, stop) в CSV.
+
+    Строки читаются итератором БД порциями по chunk_size, поэтому
+    память не зависит от размера таблицы. Возвращает число строк.
+    """
+    columns = csv_columns(model)
+    queryset = model.objects.order_by('pk')
+    if start is not None:
+        queryset = queryset.filter(pk__gte=start)
+    if stop is not None:
+        queryset = queryset.filter(pk__lt=stop)
+    rows = queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+    writer = csv.writer(file)
+    writer.writerow(columns)
+    count = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return count
+        writer.writerows(
+            [format_value(value) for value in row] for row in chunk
+        )
+        count += len(chunk)
+
+
+def shard_ranges(model, shards):
+    """Делит таблицу на shards диапазонов pk [start, stop).
+
+    Диапазоны равны по ширине, а не по числу строк: границы берутся
+    из MIN и MAX по индексу первичного ключа без подсчёта строк.
+    """
+    bounds = model.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if shards == 1 or bounds['low'] is None:
+        return [(None, None)]
+    step = -(-(bounds['high'] - bounds['low'] + 1) // shards)
+    return [
+        (
+            None if number == 0 else bounds['low'] + number * step,
+            None if number == shards - 1
+            else bounds['low'] + (number + 1) * step
+        )
+        for number in range(shards)
+    ]
+
+
+def parse_row(model, row):
+    """Значения строки CSV, приведённые к типам полей модели.
+
+    Пустая строка в поле с null=True означает NULL.
+    """
+    values = {}
+    for column, value in row.items():
+        field = model._meta.get_field(column)
+        if value == '' and field.null:
+            values[field.attname] = None
+        else:
+            values[field.attname] = field.to_python(value)
+    return values
+
+
+def row_hash(values, columns):
+    """Хеш значений колонок, одинаковый для строки CSV и строки БД.
+
+    Даты с часовым поясом сравниваются в UTC, в котором их отдаёт БД.
+    """
+    return hashlib.blake2b(
+        repr(tuple(
+            None if value is None else str(
+                value.astimezone(timezone.utc)
+                if isinstance(value, datetime) and timezone.is_aware(value)
+                else value
+            )
+            for value in (values[column] for column in columns)
+        )).encode(),
+        digest_size=16
+    ).digest()
+
+
+def upsert_batch(model, rows):
+    """Применяет порцию строк CSV по ключу id.
+
+    Текущие строки БД читаются одним запросом на порцию (с учётом
+    лимита параметров), неизменённые строки пропускаются по совпадению
+    хеша, изменённые обновляются bulk_update, новые вставляются
+    bulk_create с датами из CSV. Возвращает количество (новых,
+    изменённых, пропущенных).
+    """
+    pk = model._meta.pk.attname
+    parsed = {}
+    for row in rows:
+        values = parse_row(model, row)
+        parsed[values[pk]] = values
+    if not parsed:
+        return 0, 0, 0
+    columns = list(next(iter(parsed.values())))
+    ids = list(parsed)
+    step = connection.ops.bulk_batch_size([pk], ids)
+    current = {}
+    for start in range(0, len(ids), step):
+        current.update(
+            (values[pk], row_hash(values, columns))
+            for values in model.objects.filter(
+                pk__in=ids[start:start + step]
+            ).values(*columns)
+        )
+    changed = [
+        model(**values) for key, values in parsed.items()
+        if key in current and current[key] != row_hash(values, columns)
+    ]
+    with transaction.atomic():
+        created = [
+            model(**values)
+            for key, values in parsed.items() if key not in current
+        ]
+        create_with_dates(model, created)
+        if changed:
+            fields = [column for column in columns if column != pk]
+            # bulk_update не вызывает pre_save: ключи поиска - явно.
+            for field in model._meta.concrete_fields:
+                if (isinstance(field, SearchKeyField)
+                        and model._meta.get_field(field.source).attname
+                        in fields):
+                    for obj in changed:
+                        setattr(obj, field.attname, field.make_key(obj))
+                    fields.append(field.attname)
+            model.objects.bulk_update(changed, fields)
+    unchanged = len(parsed) - len(created) - len(changed)
+    return len(created), len(changed), unchanged
+
+
+def file_fingerprint(path):
+    """Размер и время изменения файла - признак того же файла."""
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def get_checkpoint(path):
+    """Сколько строк файла уже применено; 0 - если файл новый."""
+    checkpoint = LoadCheckpoint.objects.filter(
+        path=os.path.abspath(path), fingerprint=file_fingerprint(path)
+    ).first()
+    return 0 if checkpoint is None else checkpoint.rows
+
+
+def save_checkpoint(path, rows):
+    LoadCheckpoint.objects.update_or_create(
+        path=os.path.abspath(path),
+        defaults={'fingerprint': file_fingerprint(path), 'rows': rows}
+    )
+
+
+def clear_checkpoint(path):
+    LoadCheckpoint.objects.filter(path=os.path.abspath(path)).delete()
+
+
+def finish_bulk_load(*models):
+    """Досчитывает после bulk_create то, что при save() делают сигналы.
+
+    Пересчитывает рейтинги и распределения оценок, если загружались
+    отзывы, сдвигает последовательности id и меняет общие версии,
+    от которых зависят ETag и снимки категорий и жанров в других
+    процессах. Поисковый индекс обновляют триггеры БД.
+    """
+    with transaction.atomic():
+        if Review in models:
+            recount_titles_score()
+            recount_score_counts()
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), models
+            ):
+                cursor.execute(sql)
+        bump_versions(TITLES, GROUPS, USERS, NAMES)
+    for cache in (autocomplete, leaderboards, snapshots):
+        cache.reset()
@@ -0,0 +1,116 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.constants import EXPORT_CHUNK_SIZE, LOAD_WORKERS
+from reviews.loading import (
+    DATASET_FILES,
+    dump_rows,
+    get_model_by_name,
+    shard_ranges
+)
+
+
+class Command(BaseCommand):
+    help = 'Dump models to CSV files in the format load_csv expects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            type=str,
+            help='File names without extension, e.g. titles review'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help=f'Dump the whole dataset: {", ".join(DATASET_FILES)}'
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            default='.',
+            help='Directory for CSV files (default current directory)'
+        )
+        parser.add_argument(
+            '--shards',
+            type=int,
+            default=1,
+            help=(
+                'Split every table by id ranges into this many numbered '
+                'files, e.g. review.001.csv (default 1)'
+            )
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=LOAD_WORKERS,
+            help=f'Files written concurrently (default {LOAD_WORKERS})'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f'Rows fetched at a time (default {EXPORT_CHUNK_SIZE})'
+        )
+
+    def dump_file(self, model, path, chunk_size, start, stop, threaded):
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                count = dump_rows(model, file, chunk_size, start, stop)
+        finally:
+            if threaded:
+                # Каждый поток работает со своим соединением.
+                connection.close()
+        return f'{os.path.basename(path)}: {count} rows', count
+
+    def handle(self, *args, **options):
+        names = DATASET_FILES if options['all'] else options['names']
+        if not names:
+            raise CommandError('Pass file names or --all.')
+        if min(
+            options['shards'], options['workers'], options['chunk_size']
+        ) < 1:
+            raise CommandError(
+                'Shards, workers and chunk size must be positive.'
+            )
+        os.makedirs(options['output_dir'], exist_ok=True)
+        tasks = []
+        for name in names:
+            try:
+                model = get_model_by_name(name)
+            except LookupError:
+                raise CommandError(
+                    f'Model {name} does not exist. Check model name.'
+                )
+            ranges = shard_ranges(model, options['shards'])
+            for number, (start, stop) in enumerate(ranges, 1):
+                file_name = (
+                    f'{name}.csv' if len(ranges) == 1
+                    else f'{name}.{number:03}.csv'
+                )
+                tasks.append((
+                    model,
+                    os.path.join(options['output_dir'], file_name),
+                    options['chunk_size'],
+                    start,
+                    stop
+                ))
+        begin = monotonic()
+        workers = min(options['workers'], len(tasks))
+        if workers == 1:
+            results = [self.dump_file(*task, False) for task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda task: self.dump_file(*task, True), tasks
+                ))
+        for message, _ in results:
+            self.stdout.write(message)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully dump {sum(count for _, count in results)} rows '
+            f'to {len(tasks)} files in {monotonic() - begin:.1f} sec.'
+        ))
@@ -0,0 +1,120 @@
+from time import monotonic
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reviews.constants import (
+    GENERATE_CATEGORIES,
+    GENERATE_COMMENTS,
+    GENERATE_GENRES,
+    GENERATE_GENRES_PER_TITLE,
+    GENERATE_REVIEWS,
+    GENERATE_TITLES,
+    GENERATE_USERS,
+    GENERATE_ZIPF_EXPONENT,
+    LOAD_BATCH_SIZE
+)
+from reviews.generation import DataGenerator
+from reviews.loading import analyze, finish_bulk_load
+
+VOLUMES = {
+    'users': GENERATE_USERS,
+    'categories': GENERATE_CATEGORIES,
+    'genres': GENERATE_GENRES,
+    'titles': GENERATE_TITLES,
+    'reviews': GENERATE_REVIEWS,
+    'comments': GENERATE_COMMENTS,
+}
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, titles, reviews and comments'
+
+    def add_arguments(self, parser):
+        for name, default in VOLUMES.items():
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Number of {name} to create (default {default})'
+            )
+        parser.add_argument(
+            '--genres-per-title',
+            type=int,
+            default=GENERATE_GENRES_PER_TITLE,
+            help=(
+                'Maximum genres of a title '
+                f'(default {GENERATE_GENRES_PER_TITLE})'
+            )
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=GENERATE_ZIPF_EXPONENT,
+            help=(
+                'Exponent of the Zipf distribution of reviews per title '
+                f'(default {GENERATE_ZIPF_EXPONENT})'
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for reproducible data'
+        )
+        parser.add_argument(
+            '--now',
+            default=None,
+            help=(
+                'Reference time of generated dates in ISO 8601 '
+                '(default current time); with --seed gives identical data'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LOAD_BATCH_SIZE,
+            help=f'Rows per insert batch (default {LOAD_BATCH_SIZE})'
+        )
+
+    def progress(self, model, count, elapsed):
+        self.stdout.write(
+            f'{model.__name__}: {count} rows, '
+            f'{count / max(elapsed, 1e-6):.0f} rows/sec'
+        )
+
+    def handle(self, *args, **options):
+        if min(options[name] for name in VOLUMES) < 0:
+            raise CommandError('Volumes must not be negative.')
+        if options['batch_size'] < 1 or options['genres_per_title'] < 1:
+            raise CommandError(
+                'Batch size and genres per title must be positive.'
+            )
+        now = options['now']
+        if now is not None:
+            try:
+                now = parse_datetime(now)
+            except ValueError:
+                now = None
+            if now is None:
+                raise CommandError('--now must be an ISO 8601 datetime.')
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now)
+        start = monotonic()
+        generator = DataGenerator(
+            options['seed'], options['batch_size'], self.progress, now
+        )
+        try:
+            models = generator.generate(
+                **{name: options[name] for name in VOLUMES},
+                genres_per_title=options['genres_per_title'],
+                exponent=options['zipf']
+            )
+        except ValueError as err:
+            raise CommandError(err)
+        finish_bulk_load(*models)
+        analyze()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully generate data in {monotonic() - start:.1f} sec.'
+        ))
@@ -1,42 +1,77 @@
 import csv
+from time import monotonic
 
-from django.apps import apps
-from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.db.utils import IntegrityError
 
+from reviews.constants import LOAD_BATCH_SIZE
+from reviews.loading import (
+    bulk_insert,
+    clear_checkpoint,
+    finish_bulk_load,
+    get_checkpoint,
+    get_model_by_name,
+    read_batches,
+    save_checkpoint,
+    upsert_batch
+)
+
 
 class Command(BaseCommand):
     help = 'Load CSV file to DataBase'
-    LOOKUP_APP_NAME = 'reviews'
 
     def add_arguments(self, parser) -> None:
         parser.add_argument('csv_file', type=str, help='File with path')
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            '--bulk',
+            action='store_true',
+            help=(
+                'Insert rows in batches with bulk_create, one transaction '
+                'per batch, skipping rows that already exist'
+            )
+        )
+        mode.add_argument(
+            '--delta',
+            action='store_true',
+            help=(
+                'Upsert rows in batches by the id column: insert new rows, '
+                'update changed ones, skip unchanged ones and resume an '
+                'interrupted load from its checkpoint'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LOAD_BATCH_SIZE,
+            help=(
+                'Rows per batch in bulk and delta modes '
+                f'(default {LOAD_BATCH_SIZE})'
+            )
+        )
 
     def get_model_by_name(self, name):
-        if '_' in name:
-            name = ''.join(name.split('_'))
-        if 'user' in name:
-            return get_user_model()
-        for check_name in [name, name[:-1]]:
-            # Try plural and single spelling
-            try:
-                model = apps.get_model(
-                    app_label=self.LOOKUP_APP_NAME, model_name=check_name
-                )
-                return model
-            except LookupError:
-                pass
-        raise CommandError(
-            f'Model {name} does not exist. '
-            'Check model name.'
-        )
+        try:
+            return get_model_by_name(name)
+        except LookupError:
+            raise CommandError(
+                f'Model {name} does not exist. '
+                'Check model name.'
+            )
 
     def handle(self, *args, **options):
         file_path = options['csv_file']
         file_name = file_path.split('/')[-1]
         model_name = file_name.split('.')[0]
         model = self.get_model_by_name(model_name)
+        if options['bulk'] or options['delta']:
+            if options['batch_size'] < 1:
+                raise CommandError('Batch size must be positive.')
+            load = self.delta_load if options['delta'] else self.bulk_load
+            load(model, file_path, file_name, options['batch_size'])
+            return
         with open(file_path, encoding='utf=8') as file:
             reader = csv.DictReader(file)
             count = 0
@@ -65,3 +100,91 @@ class Command(BaseCommand):
             f'Successfully load {file_name}.\n'
             f'{count} objects added to {model.__name__} model.'
         ))
+
+    def bulk_load(self, model, file_path, file_name, batch_size):
+        count = 0
+        start = monotonic()
+        with open(file_path, encoding='utf=8') as file:
+            for batch in read_batches(file, batch_size):
+                try:
+                    bulk_insert(model, batch)
+                except IntegrityError as err:
+                    raise CommandError(
+                        f'Can not load rows {count + 1}-{count + len(batch)}. '
+                        f'{err}\nCheck that related objects are loaded.'
+                    )
+                except (
+                    FieldDoesNotExist, TypeError, ValidationError, ValueError
+                ) as err:
+                    raise CommandError(
+                        f'{err}\nPlease check fields names in CSV file. '
+                        'Field name for Related Fields should end in `_id`.'
+                    )
+                count += len(batch)
+                self.stdout.write(
+                    f'{count} rows processed, '
+                    f'{count / max(monotonic() - start, 1e-6):.0f} rows/sec'
+                )
+        finish_bulk_load(model)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully load {file_name}.\n'
+            f'{count} rows processed for {model.__name__} model '
+            f'in {monotonic() - start:.1f} sec.'
+        ))
+
+    def delta_load(self, model, file_path, file_name, batch_size):
+        count = resumed = get_checkpoint(file_path)
+        if count:
+            self.stdout.write(f'Resume {file_name} after {count} rows.')
+        totals = [0, 0, 0]
+        failed = 0
+        start = monotonic()
+        with open(file_path, encoding='utf=8') as file:
+            for batch in read_batches(file, batch_size, skip=count):
+                try:
+                    with transaction.atomic():
+                        result = upsert_batch(model, batch)
+                        save_checkpoint(file_path, count + len(batch))
+                except FieldDoesNotExist as err:
+                    raise CommandError(
+                        f'{err}\nPlease check fields names in CSV file. '
+                        'Field name for Related Fields should end in `_id`.'
+                    )
+                except (IntegrityError, ValidationError, ValueError):
+                    # Ошибочные строки пропускаются, остальные строки
+                    # порции применяются по одной.
+                    result, errors = self.upsert_rows(model, batch, count)
+                    failed += errors
+                    save_checkpoint(file_path, count + len(batch))
+                totals = [total + part for total, part in zip(totals, result)]
+                count += len(batch)
+                self.stdout.write(
+                    f'{count} rows processed, '
+                    f'{count / max(monotonic() - start, 1e-6):.0f} rows/sec'
+                )
+        clear_checkpoint(file_path)
+        created, changed, unchanged = totals
+        if resumed or created or changed:
+            finish_bulk_load(model)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully load {file_name}.\n'
+            f'{created} objects added, {changed} updated, {unchanged} '
+            f'unchanged and {failed} skipped with errors '
+            f'in {model.__name__} model.'
+        ))
+
+    def upsert_rows(self, model, rows, offset):
+        totals = [0, 0, 0]
+        errors = 0
+        for number, row in enumerate(rows, offset + 1):
+            try:
+                with transaction.atomic():
+                    result = upsert_batch(model, [row])
+            except (IntegrityError, ValidationError, ValueError) as err:
+                errors += 1
+                self.stdout.write(self.style.WARNING(
+                    f'Row {number} {row} skipped. {err}'
+                ))
+                continue
+            totals = [total + part for total, part in zip(totals, result)]
+        return totals, errors
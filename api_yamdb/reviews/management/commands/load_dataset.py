@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import monotonic
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.utils import IntegrityError
+
+from reviews.constants import LOAD_BATCH_SIZE, LOAD_WORKERS
+from reviews.loading import (
+    analyze,
+    bulk_insert,
+    deferred_indexes,
+    dependency_order,
+    finish_bulk_load,
+    get_model_by_name,
+    read_batches
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Load all CSV files of a directory to DataBase in foreign key '
+        'dependency order'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directory', type=str, help='Directory with CSV files'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LOAD_BATCH_SIZE,
+            help=f'Rows per batch (default {LOAD_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=LOAD_WORKERS,
+            help=(
+                'Files loaded concurrently when they do not depend on each '
+                f'other (default {LOAD_WORKERS}, always 1 on SQLite). '
+                'With one worker the whole dataset is loaded in a single '
+                'transaction'
+            )
+        )
+        parser.add_argument(
+            '--keep-indexes',
+            action='store_true',
+            help='Do not drop secondary indexes while loading'
+        )
+
+    def discover(self, directory):
+        # Имя модели - до первой точки, как в load_csv, поэтому части
+        # выгрузки dump_csv (titles.001.csv) загружаются в одну модель.
+        files = {}
+        for path in sorted(Path(directory).glob('*.csv')):
+            try:
+                model = get_model_by_name(path.name.split('.')[0])
+            except LookupError:
+                raise CommandError(
+                    f'Model for {path.name} does not exist. '
+                    'Check file name.'
+                )
+            files.setdefault(model, []).append(path)
+        if not files:
+            raise CommandError(f'No CSV files found in {directory}.')
+        return files
+
+    def load_file(self, model, path, batch_size, threaded):
+        count = 0
+        start = monotonic()
+        try:
+            with open(path, encoding='utf-8') as file:
+                for batch in read_batches(file, batch_size):
+                    bulk_insert(model, batch)
+                    count += len(batch)
+        except IntegrityError as err:
+            raise CommandError(f'Can not load {path.name}. {err}')
+        except (
+            FieldDoesNotExist, TypeError, ValidationError, ValueError
+        ) as err:
+            raise CommandError(
+                f'{err}\nPlease check fields names in {path.name}. '
+                'Field name for Related Fields should end in `_id`.'
+            )
+        finally:
+            if threaded:
+                # Каждый поток работает со своим соединением.
+                connection.close()
+        elapsed = monotonic() - start
+        return (
+            f'{path.name}: {count} rows processed for {model.__name__} '
+            f'model, {count / max(elapsed, 1e-6):.0f} rows/sec'
+        )
+
+    def load(self, files, groups, batch_size, workers):
+        for group in groups:
+            tasks = [
+                (model, path) for model in group for path in files[model]
+            ]
+            if workers == 1 or len(tasks) == 1:
+                for model, path in tasks:
+                    self.stdout.write(
+                        self.load_file(model, path, batch_size, False)
+                    )
+                continue
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for message in executor.map(
+                    lambda task: self.load_file(*task, batch_size, True),
+                    tasks
+                ):
+                    self.stdout.write(message)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('Batch size and workers must be positive.')
+        files = self.discover(options['directory'])
+        groups = dependency_order(list(files))
+        # SQLite допускает только одну пишущую транзакцию за раз.
+        workers = 1 if connection.vendor == 'sqlite' else options['workers']
+        models = [model for group in groups for model in group]
+        self.stdout.write('Load order: ' + ', '.join(
+            path.name for model in models for path in files[model]
+        ))
+        start = monotonic()
+        if options['keep_indexes']:
+            self.load_checked(files, groups, options['batch_size'], workers)
+        else:
+            with deferred_indexes(models):
+                self.load_checked(
+                    files, groups, options['batch_size'], workers
+                )
+        finish_bulk_load(*models)
+        analyze()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully load {len(files)} files '
+            f'in {monotonic() - start:.1f} sec.'
+        ))
+
+    def load_checked(self, files, groups, batch_size, workers):
+        if workers > 1:
+            # Потоки пишут в своих соединениях, поэтому общей транзакции
+            # нет: каждая порция фиксируется сразу, а её внешние ключи
+            # БД проверяет при фиксации. Группа загружается целиком до
+            # начала следующей, так что её строки уже видны потокам
+            # следующей группы. При ошибке загруженные порции остаются.
+            self.load(files, groups, batch_size, workers)
+            return
+        # Как loaddata: внешние ключи проверяются один раз после загрузки,
+        # и при ошибке откатывается весь набор.
+        with connection.constraint_checks_disabled():
+            with transaction.atomic():
+                self.load(files, groups, batch_size, workers)
+                try:
+                    connection.check_constraints(
+                        table_names=[model._meta.db_table for model in files]
+                    )
+                except IntegrityError as err:
+                    raise CommandError(
+                        f'Loaded data is inconsistent. {err}'
+                    )
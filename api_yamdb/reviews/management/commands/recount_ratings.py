@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.ratings import recount_score_counts, recount_titles_score
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount score sum, review count, rating and score distribution '
+        'of all titles'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = recount_titles_score()
+            recount_score_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully recount rating of {count} titles.'
+        ))
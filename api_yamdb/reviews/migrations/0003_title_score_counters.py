@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+def recount_titles_score(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    totals = Review.objects.order_by().values('title').annotate(
+        total=models.Sum('score'), count=models.Count('id')
+    )
+    Title.objects.bulk_update(
+        [
+            Title(
+                pk=row['title'],
+                score_sum=row['total'],
+                review_count=row['count'],
+                rating=row['total'] // row['count']
+            )
+            for row in totals
+        ],
+        ('score_sum', 'review_count', 'rating'),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(recount_titles_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 3.2 on 2026-10-18 14:20
+
+from django.db import migrations
+
+# Индекс берёт содержимое из reviews_title и обновляется триггерами,
+# поэтому в него попадают и массовые операции. Триггеры, которые SQLite
+# удаляет при пересоздании reviews_title, восстанавливает обработчик
+# post_migrate приложения reviews. Токенизатор не приравнивает «ё» к
+# «е», поэтому в индекс пишется текст с заменённой «ё», как в
+# search_key; регистр приводит сам токенизатор. Команда 'rebuild'
+# прочитала бы исходный текст, так что индекс заполняется запросом.
+CREATE_TITLE_SEARCH_SQL = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (
+            new.id,
+            replace(replace(new.name, 'Ё', 'Е'), 'ё', 'е'),
+            replace(replace(new.description, 'Ё', 'Е'), 'ё', 'е')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(
+            reviews_title_fts, rowid, name, description
+        )
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.name, 'Ё', 'Е'), 'ё', 'е'),
+            replace(replace(old.description, 'Ё', 'Е'), 'ё', 'е')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(
+            reviews_title_fts, rowid, name, description
+        )
+        VALUES (
+            'delete', old.id,
+            replace(replace(old.name, 'Ё', 'Е'), 'ё', 'е'),
+            replace(replace(old.description, 'Ё', 'Е'), 'ё', 'е')
+        );
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (
+            new.id,
+            replace(replace(new.name, 'Ё', 'Е'), 'ё', 'е'),
+            replace(replace(new.description, 'Ё', 'Е'), 'ё', 'е')
+        );
+    END
+    """,
+    """
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT
+        id,
+        replace(replace(name, 'Ё', 'Е'), 'ё', 'е'),
+        replace(replace(description, 'Ё', 'Е'), 'ё', 'е')
+    FROM reviews_title
+    """,
+)
+
+DROP_TITLE_SEARCH_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_sql(statements):
+    """Полнотекстовый индекс FTS5 доступен только в SQLite."""
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_score_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sql(CREATE_TITLE_SEARCH_SQL),
+            run_sql(DROP_TITLE_SEARCH_SQL)
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 19:40
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_scores(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    counts = Review.objects.order_by().values('title', 'score').annotate(
+        count=models.Count('id')
+    )
+    ScoreCount.objects.bulk_create(
+        (
+            ScoreCount(
+                title_id=row['title'], score=row['score'], count=row['count']
+            )
+            for row in counts
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'количество оценок',
+                'verbose_name_plural': 'Распределение оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_score_for_one_title'),
+        ),
+        migrations.RunPython(count_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadCheckpoint',
+            fields=[
+                ('path', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Файл')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Отпечаток файла')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='Применено строк')),
+            ],
+            options={
+                'verbose_name': 'контрольная точка загрузки',
+                'verbose_name_plural': 'Контрольные точки загрузки',
+            },
+        ),
+    ]
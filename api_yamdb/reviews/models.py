@@ -2,8 +2,9 @@ from datetime import datetime
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
 
+from core.fields import SearchKeyField
 from .constants import MAX_SCORE, MIN_SCORE, NAME_LENGTH, SLUG_LENGTH
 
 User = get_user_model()
@@ -15,6 +16,9 @@ class Genre(models.Model):
     name = models.CharField(
         verbose_name='Наименование', max_length=NAME_LENGTH
     )
+    name_key = SearchKeyField(
+        verbose_name='Ключ поиска', source='name', max_length=NAME_LENGTH
+    )
     slug = models.SlugField(
         verbose_name='Идентификатор',
         max_length=SLUG_LENGTH,
@@ -25,6 +29,9 @@ class Genre(models.Model):
         ordering = ['name']
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
+        indexes = (
+            models.Index(fields=('name',), name='genre_name_idx'),
+        )
 
     def __str__(self):
         return self.name
@@ -37,6 +44,9 @@ class Category(models.Model):
         verbose_name='Наименование',
         max_length=NAME_LENGTH
     )
+    name_key = SearchKeyField(
+        verbose_name='Ключ поиска', source='name', max_length=NAME_LENGTH
+    )
     slug = models.SlugField(
         verbose_name='Идентификатор',
         max_length=SLUG_LENGTH,
@@ -47,6 +57,9 @@ class Category(models.Model):
         ordering = ['name']
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(fields=('name',), name='category_name_idx'),
+        )
 
     def __str__(self):
         return self.name
@@ -55,9 +68,14 @@ class Category(models.Model):
 class Title(models.Model):
     """Произведения."""
 
+    SCORE_FIELDS = ('score_sum', 'review_count', 'rating')
+
     name = models.CharField(
         verbose_name='Произведение', max_length=NAME_LENGTH
     )
+    name_key = SearchKeyField(
+        verbose_name='Ключ поиска', source='name', max_length=NAME_LENGTH
+    )
     year = models.SmallIntegerField(
         verbose_name='Год выпуска',
         validators=[
@@ -81,15 +99,48 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория'
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок', default=0, editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов', default=0, editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг', null=True, blank=True, editable=False
+    )
 
     class Meta:
         ordering = ['name']
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_idx'),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=('rating', 'id'), name='title_rating_idx'
+            ),
+            models.Index(
+                fields=('review_count', 'id'), name='title_review_count_idx'
+            ),
+            models.Index(fields=('year', 'id'), name='title_year_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Счётчики оценок меняются только через reviews.ratings, иначе
+        # сохранение устаревшего экземпляра затрёт параллельные отзывы.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.SCORE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class GenreTitle(models.Model):
     """Вспомогательная модель жанров произведения."""
@@ -108,6 +159,16 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'жанр произведения'
         verbose_name_plural = 'Жанры произведения'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'), name='unique_genre_for_one_title'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genretitle_genre_title_idx'
+            ),
+        )
 
     def __str__(self):
         """Описание жанров произведения."""
@@ -151,12 +212,86 @@ class Review(models.Model):
                 name='unique_review_author_for_one_title'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         """Описание отзывов произведения."""
 
         return f'Отзыв об {self.title.name} от {self.author.username}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_score()
+        return instance
+
+    def remember_score(self):
+        """Запоминает сохранённую в БД оценку для пересчёта рейтинга."""
+        self.saved_score = (
+            self.__dict__.get('title_id'), self.__dict__.get('score')
+        )
+
+    def lock_score(self):
+        """Блокирует строку отзыва и перечитывает сохранённую оценку.
+
+        Оценка, запомненная при чтении, могла устареть: параллельный
+        запрос успел изменить или удалить отзыв. Счётчики сдвигаются
+        от значения, которое действительно перезаписывается;
+        (None, None) - строки уже нет.
+        """
+        self.saved_score = Review.objects.select_for_update().filter(
+            pk=self.pk
+        ).values_list('title_id', 'score').first() or (None, None)
+
+    def save(self, *args, **kwargs):
+        # Счётчики произведения обновляются в сигнале post_save
+        # в той же транзакции, что и сам отзыв.
+        with transaction.atomic():
+            if not self._state.adding:
+                self.lock_score()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            self.lock_score()
+            return super().delete(*args, **kwargs)
+
+
+class ScoreCount(models.Model):
+    """Количество отзывов произведения с одной оценкой."""
+
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE,
+        related_name='score_counts', verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(
+        validators=[
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE)
+        ],
+        verbose_name='Оценка'
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов', default=0
+    )
+
+    class Meta:
+        verbose_name = 'количество оценок'
+        verbose_name_plural = 'Распределение оценок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'score'), name='unique_score_for_one_title'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
 
 class Comment(models.Model):
     """Комментарии."""
@@ -178,8 +313,51 @@ class Comment(models.Model):
         ordering = ('-pub_date', 'id')
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         """Описание комментариев произведения."""
 
         return f'Комментарий отзыва {self.review.title.name}'
+
+
+class Version(models.Model):
+    """Счётчик изменений ресурса или коллекции для ETag."""
+
+    key = models.CharField(
+        verbose_name='Ключ', max_length=64, primary_key=True
+    )
+    value = models.PositiveBigIntegerField(verbose_name='Версия', default=0)
+
+    class Meta:
+        verbose_name = 'версия'
+        verbose_name_plural = 'Версии'
+
+    def __str__(self):
+        return f'{self.key}: {self.value}'
+
+
+class LoadCheckpoint(models.Model):
+    """Сколько строк CSV-файла уже применено инкрементальной загрузкой."""
+
+    path = models.CharField(
+        verbose_name='Файл', max_length=255, primary_key=True
+    )
+    fingerprint = models.CharField(
+        verbose_name='Отпечаток файла', max_length=64
+    )
+    rows = models.PositiveBigIntegerField(
+        verbose_name='Применено строк', default=0
+    )
+
+    class Meta:
+        verbose_name = 'контрольная точка загрузки'
+        verbose_name_plural = 'Контрольные точки загрузки'
+
+    def __str__(self):
+        return f'{self.path}: {self.rows}'
@@ -0,0 +1,142 @@
+from math import sqrt
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+
+from .constants import MAX_SCORE, MIN_SCORE, SCORE_PERCENTILES
+from .models import Review, ScoreCount, Title
+
+
+def change_title_score(title_id, score_delta, count_delta):
+    """Сдвигает сумму и количество оценок произведения одним UPDATE."""
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        review_count=F('review_count') + count_delta,
+        rating=Case(
+            When(
+                review_count__gt=-count_delta,
+                then=(
+                    (F('score_sum') + score_delta)
+                    / (F('review_count') + count_delta)
+                )
+            ),
+            default=None
+        )
+    )
+
+
+def change_score_count(title_id, score, count_delta):
+    """Сдвигает количество отзывов произведения с оценкой score."""
+    counts = ScoreCount.objects.filter(title_id=title_id, score=score)
+    if counts.update(count=F('count') + count_delta) or count_delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreCount.objects.create(
+                title_id=title_id, score=score, count=count_delta
+            )
+    except IntegrityError:
+        # Строку успел создать параллельный отзыв с той же оценкой.
+        counts.update(count=F('count') + count_delta)
+
+
+def recount_titles_score(queryset=None):
+    """Пересчитывает счётчики оценок произведений по таблице отзывов."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    queryset.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        )
+    )
+    return queryset.update(
+        rating=Case(
+            When(
+                review_count__gt=0,
+                then=F('score_sum') / F('review_count')
+            ),
+            default=None
+        )
+    )
+
+
+def recount_score_counts(queryset=None):
+    """Пересобирает распределение оценок произведений по таблице отзывов."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    ScoreCount.objects.filter(title__in=queryset).delete()
+    counts = Review.objects.filter(title__in=queryset).order_by().values(
+        'title', 'score'
+    ).annotate(count=Count('pk'))
+    return len(ScoreCount.objects.bulk_create(
+        (
+            ScoreCount(
+                title_id=row['title'], score=row['score'], count=row['count']
+            )
+            for row in counts
+        ),
+        batch_size=1000
+    ))
+
+
+def describe_scores(counts):
+    """Статистика оценок по гистограмме {оценка: количество отзывов}.
+
+    Медиана и процентили считаются по рангам (nearest rank) обходом
+    десяти столбцов гистограммы, без чтения самих отзывов.
+    """
+    total = sum(counts.values())
+    distribution = [
+        {'score': score, 'count': counts.get(score, 0)}
+        for score in range(MIN_SCORE, MAX_SCORE + 1)
+    ]
+    if not total:
+        return {
+            'count': 0,
+            'distribution': distribution,
+            'mean': None,
+            'median': None,
+            'stddev': None,
+            'percentiles': {
+                str(percentile): None for percentile in SCORE_PERCENTILES
+            },
+        }
+
+    def nth(rank):
+        seen = 0
+        for bar in distribution:
+            seen += bar['count']
+            if seen >= rank:
+                return bar['score']
+
+    mean = sum(bar['score'] * bar['count'] for bar in distribution) / total
+    variance = sum(
+        bar['count'] * (bar['score'] - mean) ** 2 for bar in distribution
+    ) / total
+    return {
+        'count': total,
+        'distribution': distribution,
+        'mean': round(mean, 2),
+        'median': (nth((total + 1) // 2) + nth(total // 2 + 1)) / 2,
+        'stddev': round(sqrt(variance), 2),
+        'percentiles': {
+            str(percentile): nth(max(1, -(-percentile * total // 100)))
+            for percentile in SCORE_PERCENTILES
+        },
+    }
+
+
+def get_score_distribution(title_id):
+    """Распределение оценок произведения и его статистика."""
+    return describe_scores(dict(
+        ScoreCount.objects.filter(title_id=title_id).values_list(
+            'score', 'count'
+        )
+    ))
@@ -0,0 +1,169 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from core.fields import search_key
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+# Вес совпадений в названии и в описании для BM25.
+TITLE_SEARCH_WEIGHTS = (10.0, 1.0)
+
+
+def fold_yo(column):
+    """SQL-выражение: текст колонки с «ё», заменённой на «е».
+
+    Токенизатор unicode61 приводит регистр, но не приравнивает «ё»
+    к «е», поэтому индексируемый текст нормализуется так же, как
+    search_key нормализует запрос.
+    """
+    return f"replace(replace({column}, 'Ё', 'Е'), 'ё', 'е')"
+
+
+def title_search_values(row):
+    """Значения rowid, name и description индекса для строки row."""
+    return ', '.join((
+        f'{row}.id', fold_yo(f'{row}.name'), fold_yo(f'{row}.description')
+    ))
+
+
+# Триггеры, которыми индекс с внешним содержимым следует за reviews_title.
+TITLE_SEARCH_TRIGGERS = {
+    'reviews_title_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert
+        AFTER INSERT ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(rowid, name, description)
+            VALUES ({title_search_values('new')});
+        END
+    """,
+    'reviews_title_fts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete
+        AFTER DELETE ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(
+                reviews_title_fts, rowid, name, description
+            )
+            VALUES ('delete', {title_search_values('old')});
+        END
+    """,
+    'reviews_title_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update
+        AFTER UPDATE OF name, description ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(
+                reviews_title_fts, rowid, name, description
+            )
+            VALUES ('delete', {title_search_values('old')});
+            INSERT INTO reviews_title_fts(rowid, name, description)
+            VALUES ({title_search_values('new')});
+        END
+    """,
+}
+
+
+def has_title_search_index(using=connection):
+    """Полнотекстовый индекс FTS5 создаётся миграцией только в SQLite.
+
+    Индекс берёт содержимое из reviews_title и обновляется триггерами
+    на INSERT, UPDATE и DELETE, поэтому bulk_create, update() и
+    bulk_update() попадают в него так же, как save().
+    """
+    return using.vendor == 'sqlite'
+
+
+def rebuild_title_search_index(using=connection):
+    """Заново строит индекс по таблице произведений.
+
+    Команда FTS5 'rebuild' прочитала бы исходный текст без замены «ё»,
+    поэтому индекс очищается и заполняется запросом, как в триггерах.
+    """
+    if not has_title_search_index(using):
+        return 0
+    with using.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) "
+            "VALUES ('delete-all')"
+        )
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+            f"SELECT {title_search_values('reviews_title')} "
+            'FROM reviews_title'
+        )
+        return cursor.rowcount
+
+
+def restore_title_search_triggers(using=connection):
+    """Создаёт пропавшие триггеры индекса и пересобирает его.
+
+    SQLite удаляет триггеры вместе с таблицей, а Django пересоздаёт
+    reviews_title при многих изменениях схемы. Поэтому после migrate
+    триггеры проверяются и при необходимости создаются заново; строки,
+    записанные без них, попадают в индекс при пересборке.
+    Возвращает True, если триггеры пришлось восстановить.
+    """
+    if not has_title_search_index(using):
+        return False
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' "
+            'AND name = %s', (TITLE_SEARCH_TABLE,)
+        )
+        table = cursor.fetchone()
+        if table is None or "content='reviews_title'" not in table[0]:
+            return False
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            'AND tbl_name = %s', ('reviews_title',)
+        )
+        existing = {name for name, in cursor.fetchall()}
+        missing = [
+            sql for name, sql in TITLE_SEARCH_TRIGGERS.items()
+            if name not in existing
+        ]
+        for sql in missing:
+            cursor.execute(sql)
+    if missing:
+        rebuild_title_search_index(using)
+    return bool(missing)
+
+
+def make_match_query(text):
+    """Собирает безопасный запрос FTS5 из пользовательского ввода.
+
+    Текст приводится через search_key, как и индексируемый текст.
+    Каждое слово берётся в кавычки, чтобы спецсимволы FTS5 не ломали
+    запрос; последнее слово ищется по префиксу, как в строке поиска.
+    """
+    words = re.findall(r'\w+', search_key(text))
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_titles(queryset, text):
+    """Фильтрует произведения по запросу и сортирует по релевантности."""
+    match = make_match_query(text)
+    if match is None:
+        return queryset.none()
+    if not has_title_search_index():
+        for word in re.findall(r'\w+', text):
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
+    weights = ', '.join(str(weight) for weight in TITLE_SEARCH_WEIGHTS)
+    return queryset.extra(
+        select={
+            'search_rank': f'bm25({TITLE_SEARCH_TABLE}, {weights})'
+        },
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = reviews_title.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+        order_by=['search_rank', 'id'],
+    )
@@ -0,0 +1,162 @@
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .autocomplete import autocomplete
+from .leaderboards import leaderboards
+from .models import Category, Comment, Genre, Review, Title
+from .ratings import change_score_count, change_title_score
+from .search import restore_title_search_triggers
+from .snapshots import snapshots
+from .versions import (
+    GROUPS,
+    NAMES,
+    TITLES,
+    USERS,
+    bump_versions,
+    comment_key,
+    review_comments_key,
+    review_key,
+    title_key,
+    title_reviews_key
+)
+
+User = get_user_model()
+
+
+def update_leaderboards(*title_ids):
+    for title_id in {pk for pk in title_ids if pk is not None}:
+        transaction.on_commit(
+            lambda title_id=title_id: leaderboards.update_title(title_id)
+        )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    title_id, score = getattr(instance, 'saved_score', (None, None))
+    versions = [review_key(instance.pk), title_reviews_key(instance.title_id)]
+    if title_id == instance.title_id:
+        if score != instance.score:
+            change_title_score(title_id, instance.score - score, 0)
+            change_score_count(title_id, score, -1)
+            change_score_count(title_id, instance.score, 1)
+            update_leaderboards(title_id)
+            versions += [TITLES, title_key(title_id)]
+    else:
+        if title_id is not None:
+            change_title_score(title_id, -score, -1)
+            change_score_count(title_id, score, -1)
+            versions += [title_reviews_key(title_id), title_key(title_id)]
+        change_title_score(instance.title_id, instance.score, 1)
+        change_score_count(instance.title_id, instance.score, 1)
+        update_leaderboards(title_id, instance.title_id)
+        versions += [TITLES, title_key(instance.title_id)]
+    bump_versions(*versions)
+    instance.remember_score()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    title_id, score = getattr(
+        instance, 'saved_score', (instance.title_id, instance.score)
+    )
+    if title_id is None:
+        # Отзыв уже удалил параллельный запрос и учёл его оценку.
+        return
+    change_title_score(title_id, -score, -1)
+    change_score_count(title_id, score, -1)
+    update_leaderboards(title_id)
+    bump_versions(
+        review_key(instance.pk),
+        review_comments_key(instance.pk),
+        title_reviews_key(title_id),
+        TITLES,
+        title_key(title_id)
+    )
+
+
+@receiver(post_migrate)
+def title_search_migrated(sender, using, **kwargs):
+    if sender.name == 'reviews':
+        restore_title_search_triggers(connections[using])
+
+
+def bump_names():
+    # Отдельным UPDATE и до обновления индекса: вместе с новыми ключами
+    # bump_versions сдвигает версии дважды, а автодополнение узнаёт
+    # свою запись по сдвигу NAMES ровно на единицу.
+    bump_versions(NAMES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def autocomplete_saved(sender, instance, **kwargs):
+    bump_names()
+    transaction.on_commit(lambda: autocomplete.update(instance))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def autocomplete_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    bump_names()
+    transaction.on_commit(lambda: autocomplete.remove(sender, pk))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def leaderboards_title_changed(sender, instance, **kwargs):
+    update_leaderboards(instance.pk)
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def leaderboards_group_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: leaderboards.remove_group(sender, pk))
+
+
+@receiver(post_save, sender=Title)
+def title_version_saved(sender, instance, **kwargs):
+    bump_versions(TITLES, title_key(instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+def title_version_deleted(sender, instance, **kwargs):
+    bump_versions(
+        TITLES, title_key(instance.pk), title_reviews_key(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def group_version_changed(sender, instance, **kwargs):
+    bump_versions(GROUPS)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_version_changed(sender, instance, **kwargs):
+    bump_versions(
+        comment_key(instance.pk), review_comments_key(instance.review_id)
+    )
+
+
+@receiver(post_save, sender=User)
+def user_version_saved(sender, instance, created, **kwargs):
+    # Имя автора входит в отзывы и комментарии.
+    if not created:
+        bump_versions(USERS)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def snapshot_changed(sender, instance, **kwargs):
+    transaction.on_commit(snapshots.reset)
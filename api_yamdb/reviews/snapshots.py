@@ -0,0 +1,114 @@
+from copy import copy
+from threading import RLock
+from time import monotonic
+
+from core.fields import search_key
+from .constants import SNAPSHOT_CHECK_INTERVAL
+from .models import Category, Genre
+from .versions import GROUPS, get_versions
+
+
+class GroupSnapshot:
+    """Снимок таблицы категорий или жанров в памяти процесса.
+
+    Хранит объекты в порядке списка (по названию), словари по slug и id
+    и уже сериализованные списки и представления по id для каждого
+    класса сериализатора. Снимок пересоздаётся при смене версии, так что
+    представление определяется моделью, id и версией.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.objects = list(model.objects.order_by('name', 'id'))
+        self.by_slug = {obj.slug: obj for obj in self.objects}
+        self.by_id = {obj.pk: obj for obj in self.objects}
+        self.serialized = {}
+        self.representations = {}
+
+    def get(self, slug):
+        obj = self.by_slug.get(slug)
+        return None if obj is None else copy(obj)
+
+    def get_many(self, slugs):
+        return {
+            slug: copy(self.by_slug[slug])
+            for slug in slugs if slug in self.by_slug
+        }
+
+    def represent(self, serializer_class, pk):
+        """Готовое представление объекта или None, если его нет в снимке."""
+        representations = self.representations.get(serializer_class)
+        if representations is None:
+            representations = self.representations[serializer_class] = dict(
+                zip(self.by_id, self.serialize(serializer_class))
+            )
+        return representations.get(pk)
+
+    def serialize(self, serializer_class, terms=(), prefix=''):
+        """Сериализованный список, отфильтрованный как SearchKeyFilter.
+
+        Каждое слово из terms должно входить в название, а prefix -
+        быть его началом.
+        """
+        data = self.serialized.get(serializer_class)
+        if data is None:
+            data = self.serialized[serializer_class] = list(
+                serializer_class(self.objects, many=True).data
+            )
+        if not terms and not prefix:
+            return data
+        keys = [search_key(term) for term in terms]
+        prefix = search_key(prefix)
+        return [
+            item for obj, item in zip(self.objects, data)
+            if obj.name_key.startswith(prefix)
+            and all(key in obj.name_key for key in keys)
+        ]
+
+
+class Snapshots:
+    """Снимки категорий и жанров, общие для всех запросов процесса.
+
+    Снимок строится при первом обращении. Изменения в этом процессе
+    сбрасывают его сигналами, изменения в других процессах - через
+    счётчик версий GROUPS, который читается не чаще раза в
+    `check_interval` секунд, поэтому остальные запросы обходятся без
+    обращений к БД. fresh=True сверяет версию сразу - для записи.
+    """
+
+    models = (Category, Genre)
+
+    def __init__(self, check_interval=SNAPSHOT_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.lock = RLock()
+        self.reset()
+
+    def check(self, fresh=False):
+        """Версия, по которой построены снимки, сверенная с GROUPS."""
+        with self.lock:
+            now = monotonic()
+            if (fresh or self.checked_at is None
+                    or now - self.checked_at > self.check_interval):
+                version, = get_versions(GROUPS)
+                self.checked_at = now
+                if version != self.version:
+                    self.version = version
+                    self.tables = {}
+            return self.version
+
+    def get(self, model, fresh=False):
+        with self.lock:
+            self.check(fresh)
+            table = self.tables.get(model)
+            if table is None:
+                table = self.tables[model] = GroupSnapshot(model)
+            return table
+
+    def reset(self):
+        with self.lock:
+            self.tables = {}
+            self.version = None
+            self.checked_at = None
+
+
+snapshots = Snapshots()
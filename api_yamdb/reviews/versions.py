@@ -0,0 +1,52 @@
+from django.db.models import F
+
+from .models import Version
+
+TITLES = 'titles'
+GROUPS = 'groups'
+USERS = 'users'
+# Названия произведений, жанров и категорий: без оценок и рейтингов.
+NAMES = 'names'
+
+
+def title_key(title_id):
+    return f'title:{title_id}'
+
+
+def title_reviews_key(title_id):
+    return f'title:{title_id}:reviews'
+
+
+def review_key(review_id):
+    return f'review:{review_id}'
+
+
+def review_comments_key(review_id):
+    return f'review:{review_id}:comments'
+
+
+def comment_key(comment_id):
+    return f'comment:{comment_id}'
+
+
+def bump_versions(*keys):
+    """Увеличивает счётчики версий одним UPDATE.
+
+    Недостающие счётчики создаются и увеличиваются повторным UPDATE;
+    уже существующие при этом увеличатся дважды - для ETag важно
+    только, что версия изменилась.
+    """
+    versions = Version.objects.filter(key__in=keys)
+    if versions.update(value=F('value') + 1) < len(set(keys)):
+        Version.objects.bulk_create(
+            [Version(key=key) for key in set(keys)], ignore_conflicts=True
+        )
+        versions.update(value=F('value') + 1)
+
+
+def get_versions(*keys):
+    """Текущие версии ключей в порядке ключей, 0 - если изменений не было."""
+    values = dict(
+        Version.objects.filter(key__in=keys).values_list('key', 'value')
+    )
+    return [values.get(key, 0) for key in keys]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 14:40
+
+from django.db import migrations
+import core.fields
+
+
+def fill_username_keys(apps, schema_editor):
+    Users = apps.get_model('users', 'Users')
+    users = list(Users.objects.only('pk', 'username'))
+    for user in users:
+        user.username_key = core.fields.search_key(user.username)
+    Users.objects.bulk_update(users, ('username_key',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='users',
+            name='username_key',
+            field=core.fields.SearchKeyField(default='', max_length=150, source='username', verbose_name='Ключ поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_username_keys, migrations.RunPython.noop),
+    ]
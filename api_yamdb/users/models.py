@@ -1,7 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
-from .constants import USER_ROLE_LENGTH, EMAIL_LENGTH
+from core.fields import SearchKeyField
+from .constants import USER_ROLE_LENGTH, EMAIL_LENGTH, USERNAME_LENGTH
 
 
 class Users(AbstractUser):
@@ -20,6 +21,9 @@ class Users(AbstractUser):
     role = models.CharField(
         'Роль', max_length=USER_ROLE_LENGTH, choices=ROLES, default=USER
     )
+    username_key = SearchKeyField(
+        'Ключ поиска', source='username', max_length=USERNAME_LENGTH
+    )
 
     @property
     def is_admin(self):
@@ -0,0 +1,10 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'api_yamdb'))
+
+pytest_plugins = [
+    'tests.fixtures.fixture_caches',
+]
@@ -0,0 +1,348 @@
+"""Бенчмарк всех маршрутов api/urls.py на сгенерированном наборе данных.
+
+Каждый эндпоинт вызывается через тестовый клиент ROUNDS раз после
+прогрева. Для него записываются перцентили времени ответа, число
+SQL-запросов и число прочитанных из БД строк. Результаты сравниваются
+с базовой линией из BASELINE. Тест падает, если запросов или строк
+стало больше, чем позволяет бюджет. Время зависит от машины и её
+загрузки, поэтому медиана сравнивается, только если задан
+BENCHMARK_TIME_BUDGET: тест падает, если она выросла больше чем на
+TIME_BUDGET и TIME_NOISE_MS. Базовая линия записывается, если её нет
+или задано BENCHMARK_UPDATE=1.
+
+Параметры берутся из переменных окружения:
+BENCHMARK_SCALE - множитель объёма данных (1 - 50 000 отзывов),
+BENCHMARK_ROUNDS - число замеров на эндпоинт,
+BENCHMARK_TIME_BUDGET - допустимый рост медианы времени в долях
+(без него время не проверяется),
+BENCHMARK_QUERY_BUDGET - допустимое число лишних запросов,
+BENCHMARK_ROWS_BUDGET - допустимый рост числа строк в долях,
+BENCHMARK_BASELINE - путь к файлу базовой линии.
+"""
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median_low, quantiles
+from time import perf_counter
+
+import pytest
+
+SEED = 24
+# Опорное время дат набора: с ним набор одинаков при каждом запуске.
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SCALE = float(os.getenv('BENCHMARK_SCALE', '1'))
+ROUNDS = int(os.getenv('BENCHMARK_ROUNDS', '20'))
+WARMUP = 2
+TIME_BUDGET = os.getenv('BENCHMARK_TIME_BUDGET')
+QUERY_BUDGET = int(os.getenv('BENCHMARK_QUERY_BUDGET', '0'))
+ROWS_BUDGET = float(os.getenv('BENCHMARK_ROWS_BUDGET', '0.1'))
+BASELINE = Path(os.getenv(
+    'BENCHMARK_BASELINE', Path(__file__).with_name('endpoints.json')
+))
+UPDATE = os.getenv('BENCHMARK_UPDATE') == '1'
+# Разброс времени, который не считается регрессией на быстрых эндпоинтах.
+TIME_NOISE_MS = 1.0
+VOLUMES = {
+    'users': 2000,
+    'categories': 10,
+    'genres': 30,
+    'titles': 5000,
+    'reviews': 50000,
+    'comments': 20000,
+}
+
+# Имя: (клиент, метод, адрес, тело запроса). Адрес и строковые значения
+# тела подставляются из контекста набора данных и номера замера.
+ENDPOINTS = {
+    'categories-list': ('anonymous', 'get', '/api/v1/categories/', None),
+    'categories-top': (
+        'anonymous', 'get', '/api/v1/categories/{category}/top/', None
+    ),
+    'genres-list': ('anonymous', 'get', '/api/v1/genres/?search=Жанр 1', None),
+    'genres-top': ('anonymous', 'get', '/api/v1/genres/{genre}/top/', None),
+    'titles-list': ('anonymous', 'get', '/api/v1/titles/', None),
+    'titles-ordering': (
+        'anonymous', 'get', '/api/v1/titles/?ordering=-rating', None
+    ),
+    'titles-page': ('anonymous', 'get', '/api/v1/titles/?page={page}', None),
+    'titles-detail': ('anonymous', 'get', '/api/v1/titles/{title}/', None),
+    'titles-filter-genre': (
+        'anonymous', 'get', '/api/v1/titles/?genre={genre}', None
+    ),
+    'titles-filter-category-year': (
+        'anonymous', 'get',
+        '/api/v1/titles/?category={category}&year_min=1990&year_max=2000',
+        None
+    ),
+    'titles-search': (
+        'anonymous', 'get', '/api/v1/titles/?search=Тёмная', None
+    ),
+    'titles-fulltext': ('anonymous', 'get', '/api/v1/titles/?q=звезда', None),
+    'titles-score-distribution': (
+        'anonymous', 'get', '/api/v1/titles/{title}/score-distribution/', None
+    ),
+    'titles-create': (
+        'admin', 'post', '/api/v1/titles/',
+        {
+            'name': 'Новое произведение {number}', 'year': '2000',
+            'genre': '{genre}', 'category': '{category}'
+        }
+    ),
+    'reviews-list': (
+        'anonymous', 'get', '/api/v1/titles/{title}/reviews/', None
+    ),
+    'reviews-detail': (
+        'anonymous', 'get', '/api/v1/titles/{title}/reviews/{review}/', None
+    ),
+    'reviews-create': (
+        'author', 'post', '/api/v1/titles/{fresh_title}/reviews/',
+        {'text': 'Текст отзыва', 'score': '7'}
+    ),
+    'comments-list': (
+        'anonymous', 'get',
+        '/api/v1/titles/{title}/reviews/{review}/comments/', None
+    ),
+    'comments-detail': (
+        'anonymous', 'get',
+        '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/', None
+    ),
+    'comments-create': (
+        'author', 'post', '/api/v1/titles/{title}/reviews/{review}/comments/',
+        {'text': 'Текст комментария'}
+    ),
+    'users-list': ('admin', 'get', '/api/v1/users/', None),
+    'users-search': ('admin', 'get', '/api/v1/users/?search=user1', None),
+    'users-detail': ('admin', 'get', '/api/v1/users/{username}/', None),
+    'users-me': ('author', 'get', '/api/v1/users/me/', None),
+    'signup': (
+        'anonymous', 'post', '/api/v1/auth/signup/',
+        {'username': 'bench{number}', 'email': 'bench{number}@yamdb.fake'}
+    ),
+    'token': (
+        'anonymous', 'post', '/api/v1/auth/token/',
+        {'username': '{author}', 'confirmation_code': '{code}'}
+    ),
+    'autocomplete': (
+        'anonymous', 'get', '/api/v1/autocomplete/?q=Тёмная зв', None
+    ),
+    'export-titles': (
+        'admin', 'get', '/api/v1/export/titles.ndjson', None
+    ),
+}
+
+
+class QueryStats:
+    """Счётчик SQL-запросов и прочитанных строк для execute_wrapper.
+
+    Методы чтения подменяются на экземпляре CursorWrapper, через который
+    выполнен запрос, поэтому учитываются строки, которые Django
+    действительно забрал из курсора.
+    """
+
+    FETCH_METHODS = ('fetchone', 'fetchmany', 'fetchall')
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        cursor = context['cursor']
+        if 'fetchone' not in vars(cursor):
+            for name in self.FETCH_METHODS:
+                setattr(cursor, name, self.counting(getattr(cursor, name)))
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def counting(self, fetch):
+        def wrapper(*args):
+            result = fetch(*args)
+            if isinstance(result, tuple):
+                self.rows += 1
+            elif result is not None:
+                self.rows += len(result)
+            return result
+        return wrapper
+
+
+def measure(client, method, url, data):
+    from django.db import connection
+
+    stats = QueryStats()
+    with connection.execute_wrapper(stats):
+        start = perf_counter()
+        response = getattr(client, method)(url, data)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        elapsed = perf_counter() - start
+    assert response.status_code < 400, (
+        f'Проверьте, что {method.upper()}-запрос к `{url}` выполняется '
+        f'успешно, получен статус {response.status_code}.'
+    )
+    return elapsed, stats
+
+
+def load_baseline():
+    if UPDATE or not BASELINE.exists():
+        return None
+    baseline = json.loads(BASELINE.read_text())
+    if baseline['dataset'] != dataset_parameters():
+        return None
+    return baseline['endpoints']
+
+
+def dataset_parameters():
+    return {'seed': SEED, 'now': NOW.isoformat(), 'scale': SCALE}
+
+
+@pytest.fixture(scope='module')
+def dataset(django_db_setup, django_db_blocker):
+    """Набор данных на весь модуль: генерируется один раз.
+
+    Сами тесты выполняются в транзакциях с откатом, поэтому записи
+    бенчмарков не меняют набор между эндпоинтами.
+    """
+    from django.contrib.auth.tokens import default_token_generator
+    from django.core.management import call_command
+    from django.db.models import Count
+    from rest_framework.settings import api_settings
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.constants import (
+        GENERATE_GENRES_PER_TITLE, GENERATE_ZIPF_EXPONENT
+    )
+    from reviews.generation import DataGenerator
+    from reviews.loading import analyze, finish_bulk_load
+    from reviews.models import Comment, Review, Title, User
+
+    with django_db_blocker.unblock():
+        models = DataGenerator(SEED, now=NOW).generate(
+            **{
+                name: int(count * SCALE) if name != 'categories' else count
+                for name, count in VOLUMES.items()
+            },
+            genres_per_title=GENERATE_GENRES_PER_TITLE,
+            exponent=GENERATE_ZIPF_EXPONENT
+        )
+        finish_bulk_load(*models)
+        analyze()
+        admin = User.objects.create_user(
+            username='bench_admin', email='bench_admin@yamdb.fake',
+            role='admin'
+        )
+        author = User.objects.create_user(
+            username='bench_author', email='bench_author@yamdb.fake'
+        )
+        title = Title.objects.select_related('category').order_by(
+            '-review_count', 'id'
+        ).first()
+        review = title.reviews.annotate(
+            comment_count=Count('comments')
+        ).order_by('-comment_count', 'id').first()
+        clients = {'anonymous': APIClient()}
+        for name, user in (('admin', admin), ('author', author)):
+            clients[name] = APIClient()
+            clients[name].credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            )
+        context = {
+            # Страница на пятой части списка: при SCALE=1 это 200-я.
+            'page': max(
+                1, Title.objects.count() // api_settings.PAGE_SIZE // 5
+            ),
+            'title': title.pk,
+            'category': title.category.slug,
+            'genre': title.genre.order_by('id').first().slug,
+            'review': review.pk,
+            'comment': Comment.objects.filter(
+                review=review
+            ).order_by('id').first().pk,
+            'username': review.author.username,
+            'author': author.username,
+            'code': default_token_generator.make_token(author),
+            'fresh_titles': list(Title.objects.order_by('id').values_list(
+                'pk', flat=True
+            )[:WARMUP + ROUNDS]),
+        }
+        print(
+            f'\nDataset: {Title.objects.count()} titles, '
+            f'{Review.objects.count()} reviews, '
+            f'{Comment.objects.count()} comments, '
+            f'{User.objects.count()} users'
+        )
+    yield clients, context
+    with django_db_blocker.unblock():
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.fixture(scope='module')
+def results():
+    """Результаты модуля; записываются в BASELINE, если его обновляют."""
+    results = {}
+    yield results
+    if UPDATE or not BASELINE.exists():
+        BASELINE.write_text(json.dumps(
+            {'dataset': dataset_parameters(), 'endpoints': results},
+            ensure_ascii=False, indent=2, sort_keys=True
+        ) + '\n')
+        print(f'\nBaseline written to {BASELINE}')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ENDPOINTS)
+def test_endpoint(name, dataset, results):
+    clients, context = dataset
+    client_name, method, url, data = ENDPOINTS[name]
+    timings, queries, rows = [], [], []
+    for number in range(WARMUP + ROUNDS):
+        values = {
+            **context,
+            'number': number,
+            'fresh_title': context['fresh_titles'][number]
+        }
+        elapsed, stats = measure(
+            clients[client_name], method, url.format(**values),
+            data and {
+                key: value.format(**values) for key, value in data.items()
+            }
+        )
+        if number >= WARMUP:
+            timings.append(elapsed)
+            queries.append(stats.queries)
+            rows.append(stats.rows)
+    p50, p90, p99 = (
+        quantiles(timings, n=100, method='inclusive')[index] * 1000
+        for index in (49, 89, 98)
+    )
+    result = results[name] = {
+        'p50_ms': round(p50, 3),
+        'p90_ms': round(p90, 3),
+        'p99_ms': round(p99, 3),
+        'queries': median_low(queries),
+        'rows': median_low(rows),
+    }
+    print(
+        f'\n{name}: p50 {p50:.2f} ms, p90 {p90:.2f} ms, '
+        f'p99 {p99:.2f} ms, {result["queries"]} queries, '
+        f'{result["rows"]} rows'
+    )
+    baseline = (load_baseline() or {}).get(name)
+    if baseline is None:
+        return
+    assert result['queries'] <= baseline['queries'] + QUERY_BUDGET, (
+        f'{name}: {result["queries"]} SQL-запросов против '
+        f'{baseline["queries"]} в базовой линии.'
+    )
+    assert result['rows'] <= baseline['rows'] * (1 + ROWS_BUDGET), (
+        f'{name}: прочитано {result["rows"]} строк против '
+        f'{baseline["rows"]} в базовой линии.'
+    )
+    if TIME_BUDGET is None:
+        return
+    assert result['p50_ms'] <= (
+        baseline['p50_ms'] * (1 + float(TIME_BUDGET)) + TIME_NOISE_MS
+    ), (
+        f'{name}: медиана {result["p50_ms"]} мс против '
+        f'{baseline["p50_ms"]} мс в базовой линии.'
+    )
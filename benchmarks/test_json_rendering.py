@@ -0,0 +1,49 @@
+from io import BytesIO
+
+import pytest
+
+from tests.utils import create_title_page
+from .utils import PAGE_SIZE, measure
+
+
+@pytest.mark.django_db(transaction=True)
+def test_renderer_throughput(django_user_model):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.plans import get_plan
+    from api.renderers import FastJSONRenderer
+    from api.serializers import TitleReadSerializer
+    from reviews.models import Title
+
+    create_title_page(django_user_model, PAGE_SIZE)
+    plan = get_plan(TitleReadSerializer)
+    page = {
+        'count': PAGE_SIZE,
+        'next': None,
+        'previous': None,
+        'results': plan.render(
+            plan.values(Title.objects.order_by('name', 'id'))[:PAGE_SIZE]
+        ),
+    }
+    body = JSONRenderer().render(page)
+    assert FastJSONRenderer().render(page) == body
+
+    slow = measure(lambda: JSONRenderer().render(page))
+    fast = measure(lambda: FastJSONRenderer().render(page))
+    print(
+        f'\ntitles, {PAGE_SIZE} rows, {len(body)} bytes: '
+        f'json {slow * 1000:.3f} ms, orjson {fast * 1000:.3f} ms, '
+        f'x{slow / fast:.1f}'
+    )
+    assert fast < slow
+
+    slow = measure(lambda: JSONParser().parse(BytesIO(body)))
+    fast = measure(lambda: FastJSONParser().parse(BytesIO(body)))
+    print(
+        f'parse {len(body)} bytes: '
+        f'json {slow * 1000:.3f} ms, orjson {fast * 1000:.3f} ms, '
+        f'x{slow / fast:.1f}'
+    )
+    assert fast < slow
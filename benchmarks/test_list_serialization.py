@@ -0,0 +1,56 @@
+import pytest
+
+from tests.utils import create_title_page
+from .utils import PAGE_SIZE, measure
+
+
+@pytest.mark.django_db(transaction=True)
+def test_plan_throughput(django_user_model):
+    from api.plans import get_plan
+    from api.serializers import (
+        CommentSerializer, ReviewSerializer, TitleReadSerializer
+    )
+    from reviews.models import Comment, Review, Title
+
+    title, _ = create_title_page(django_user_model, PAGE_SIZE)
+    review = title.reviews.order_by('id').first()
+    cases = (
+        (
+            'titles', TitleReadSerializer,
+            Title.objects.select_related('category').prefetch_related(
+                'genre'
+            ).order_by('name', 'id')
+        ),
+        (
+            'reviews', ReviewSerializer,
+            Review.objects.filter(title=title).select_related(
+                'author'
+            ).order_by('-pub_date', 'id')
+        ),
+        (
+            'comments', CommentSerializer,
+            Comment.objects.filter(review=review).select_related(
+                'author'
+            ).order_by('-pub_date', 'id')
+        ),
+    )
+    for name, serializer_class, queryset in cases:
+        plan = get_plan(serializer_class)
+
+        def serialize():
+            return serializer_class(
+                queryset.all()[:PAGE_SIZE], many=True
+            ).data
+
+        def render():
+            return plan.render(plan.values(queryset.all())[:PAGE_SIZE])
+
+        assert serialize() == render()
+        slow = measure(serialize)
+        fast = measure(render)
+        print(
+            f'\n{name}, {PAGE_SIZE} rows with queries: '
+            f'serializer {slow * 1000:.2f} ms, '
+            f'plan {fast * 1000:.2f} ms, x{slow / fast:.1f}'
+        )
+        assert fast < slow
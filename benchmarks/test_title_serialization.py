@@ -0,0 +1,70 @@
+from statistics import median
+from time import perf_counter
+
+import pytest
+
+PAGE_SIZE = 100
+GENRES = 15
+ROUNDS = 30
+
+
+def create_page():
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {number}', slug=f'c{number}')
+        for number in range(5)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {number}', slug=f'g{number}')
+        for number in range(GENRES)
+    ]
+    for number in range(PAGE_SIZE):
+        title = Title.objects.create(
+            name=f'Произведение {number}',
+            year=2000,
+            description='Описание',
+            category=categories[number % len(categories)]
+        )
+        for shift in range(3):
+            GenreTitle.objects.create(
+                title=title, genre=genres[(number + shift) % GENRES]
+            )
+    return list(
+        Title.objects.select_related('category').prefetch_related('genre')
+    )
+
+
+def measure(serializer_class, titles):
+    timings = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        serializer_class(titles, many=True).data
+        timings.append(perf_counter() - start)
+    return median(timings)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_representation_cache():
+    from api.serializers import (
+        CategorySerializer, GenreSerializer, TitleBase, TitleReadSerializer
+    )
+
+    class NestedTitleSerializer(TitleBase):
+        category = CategorySerializer(read_only=True)
+        genre = GenreSerializer(many=True, read_only=True)
+
+    titles = create_page()
+    assert (
+        NestedTitleSerializer(titles, many=True).data
+        == TitleReadSerializer(titles, many=True).data
+    )
+    nested = measure(NestedTitleSerializer, titles)
+    cached = measure(TitleReadSerializer, titles)
+    print(
+        f'\nTitleReadSerializer, {PAGE_SIZE} titles: '
+        f'nested serializers {nested * 1000:.2f} ms, '
+        f'cached representations {cached * 1000:.2f} ms, '
+        f'x{nested / cached:.1f}'
+    )
+    assert cached < nested
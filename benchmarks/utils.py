@@ -0,0 +1,14 @@
+from statistics import median
+from time import perf_counter
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def measure(function):
+    timings = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return median(timings)
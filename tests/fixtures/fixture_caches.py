@@ -0,0 +1,20 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Сбрасывает данные, которые процесс держит в памяти между запросами.
+
+    Тесты очищают БД без сигналов моделей, поэтому без сброса снимки,
+    индексы и доски переходили бы из одного теста в другой.
+    """
+    from reviews.autocomplete import autocomplete
+    from reviews.leaderboards import leaderboards
+    from reviews.snapshots import snapshots
+
+    caches = (autocomplete, leaderboards, snapshots)
+    for cache in caches:
+        cache.reset()
+    yield
+    for cache in caches:
+        cache.reset()
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'текст', 2)
+        create_single_review(moderator_client, title_id, 'текст', 9)
+
+        assert self.get_title(admin_client, title_id)['rating'] == 5, (
+            'Проверьте, что после создания отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            ),
+            data={'score': 7}
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 8, (
+            'Проверьте, что после изменения оценки рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            )
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 9, (
+            'Проверьте, что после удаления отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+    def test_02_recount_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'текст', 6)
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+
+        call_command('recount_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count, title.rating) == (
+            6, 1, 6
+        ), 'Команда `recount_ratings` должна восстанавливать счётчики.'
+        assert Title.objects.get(pk=titles[1]['id']).rating is None
+
+    def test_03_concurrent_changes_of_one_review(self, admin, user):
+        from reviews.models import Review, ScoreCount, Title
+
+        title = Title.objects.create(name='Фильм', year=2000)
+        Review.objects.create(title=title, author=admin, text='т', score=5)
+        review = Review.objects.create(
+            title=title, author=user, text='т', score=5
+        )
+
+        def counters():
+            title.refresh_from_db()
+            return (
+                title.score_sum, title.review_count, title.rating,
+                dict(ScoreCount.objects.filter(
+                    title=title, count__gt=0
+                ).values_list('score', 'count'))
+            )
+
+        # Два запроса прочитали отзыв до того, как любой из них записал.
+        first, second = [Review.objects.get(pk=review.pk) for _ in range(2)]
+        first.score = 9
+        first.save()
+        second.score = 7
+        second.save()
+        assert counters() == (12, 2, 6, {5: 1, 7: 1}), (
+            'Проверьте, что изменение оценки учитывает значение, '
+            'сохранённое в БД, а не прочитанное запросом.'
+        )
+
+        first, second = [Review.objects.get(pk=review.pk) for _ in range(2)]
+        first.delete()
+        second.delete()
+        assert counters() == (5, 1, 5, {5: 1}), (
+            'Проверьте, что повторное удаление отзыва не меняет счётчики '
+            'произведения.'
+        )
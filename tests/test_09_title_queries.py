@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+
+
+def create_catalogue(count):
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(4)
+    ]
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {idx}',
+            year=2000,
+            description='Описание',
+            category=categories[idx % len(categories)]
+        )
+        for idx in range(count)
+    ]
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in titles
+        for genre in genres[:title.pk % len(genres) + 1]
+    )
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def test_01_title_list_query_count(self, client, monkeypatch):
+        create_catalogue(100)
+        # Первый запрос загружает снимок категорий и жанров.
+        client.get(self.TITLES_URL)
+
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 5)
+        small_page = self.count_queries(client, self.TITLES_URL)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 100)
+        large_page = self.count_queries(client, self.TITLES_URL)
+
+        assert small_page == large_page == 4, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'постоянное число SQL-запросов независимо от размера страницы: '
+            'версии для ETag, подсчёт, выборка произведений с категориями '
+            'и жанры.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        titles = create_catalogue(3)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].pk)
+        client.get(url)
+        assert self.count_queries(client, url) == 3, (
+            f'Проверьте, что GET-запрос к `{url}` загружает версии для ETag '
+            'и произведение вместе с категорией и жанрами за три SQL-запроса.'
+        )
+
+    def test_03_title_write_query_count(self, admin_client, admin):
+        from reviews.models import Title
+
+        titles = create_catalogue(1)
+        data = {
+            'name': 'Новое произведение',
+            'year': 2000,
+            'genre': ['genre-0', 'genre-1', 'genre-2'],
+            'category': 'cat-1',
+            'description': 'Описание'
+        }
+        admin_client.get('/api/v1/categories/')
+        admin_client.get('/api/v1/genres/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        # Смена версий для ETag не относится к построению ответа.
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'] != 'BEGIN'
+            and not query['sql'].startswith((
+                'UPDATE "reviews_version"',
+                'INSERT OR IGNORE INTO "reviews_version"'
+            ))
+        ]
+        assert len(queries) == 5, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` читает '
+            'пользователя и сверяет версии снимков категорий и жанров по '
+            'одному запросу, а ответ строится без дополнительных обращений '
+            'к БД.'
+        )
+        assert response.json()['category'] == {
+            'name': 'Категория 1', 'slug': 'cat-1'
+        }
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'genre-0', 'genre-1', 'genre-2'
+        ]
+        assert response.json()['rating'] is None
+
+        Title.objects.filter(pk=titles[0].pk).update(rating=7)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].pk)
+        response = admin_client.patch(
+            url, data={'genre': ['genre-3']}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['rating'] == 7, (
+            f'Проверьте, что ответ на PATCH-запрос к `{url}` содержит '
+            'рейтинг произведения.'
+        )
+        assert response.json()['genre'] == [
+            {'name': 'Жанр 3', 'slug': 'genre-3'}
+        ]
@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+
+
+def walk(client, url, key='next'):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсора пагинация не считает COUNT(*).'
+        )
+        pages.append(data['results'])
+        url = data[key]
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_titles_cursor_walk(self, client):
+        from reviews.models import Title
+
+        for idx in range(12):
+            Title.objects.create(
+                name=f'Произведение {idx % 4}', year=2000, description=''
+            )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        pages = walk(client, f'{self.TITLES_URL}?cursor=')
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert [title['id'] for page in pages for title in page] == expected, (
+            f'Проверьте, что `{self.TITLES_URL}?cursor=` отдаёт произведения '
+            'по порядку (name, id) без пропусков и повторов.'
+        )
+
+        last_page = client.get(
+            client.get(
+                client.get(f'{self.TITLES_URL}?cursor=').json()['next']
+            ).json()['next']
+        ).json()
+        back = walk(client, last_page['previous'], key='previous')
+        assert [title['id'] for page in back for title in page] == (
+            expected[5:10] + expected[:5]
+        ), 'Проверьте, что ссылка `previous` ведёт на предыдущие страницы.'
+
+    def test_02_page_number_mode_kept(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(name='Произведение', year=2000, description='')
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 1 and 'results' in data, (
+            'Без параметра `cursor` пагинация должна остаться постраничной.'
+        )
+
+    def test_03_reviews_cursor_order(self, client, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        for idx in range(7):
+            author = django_user_model.objects.create_user(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='текст', score=5
+            )
+        expected = list(
+            Review.objects.order_by('-pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        pages = walk(client, f'{url}?cursor=')
+        assert [review['id'] for page in pages for review in page] == (
+            expected
+        ), f'Проверьте порядок (-pub_date, id) отзывов в `{url}?cursor=`.'
+
+    def test_04_invalid_cursor(self, admin_client):
+        response = admin_client.get(f'{self.USERS_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что некорректный курсор возвращает ответ со '
+            'статусом 404.'
+        )
+        response = admin_client.get(f'{self.USERS_URL}?cursor=')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_05_cursor_rejects_other_ordering(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(name='Произведение', year=2000, description='')
+        for query in ('ordering=-rating', 'ordering=-name', 'q=произведение'):
+            url = f'{self.TITLES_URL}?{query}&cursor='
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` возвращает ответ со статусом 400: '
+                'курсор поддерживает только порядок (name, id).'
+            )
+        response = client.get(f'{self.TITLES_URL}?ordering=name&cursor=')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что порядок, совпадающий с ключом курсора, '
+            'разрешён.'
+        )
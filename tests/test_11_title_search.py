@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?q=` возвращает '
+            'ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranks_by_relevance(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Война и мир', year=1869, description='Роман-эпопея'
+        )
+        Title.objects.create(
+            name='Анна Каренина', year=1877, description='Не про войну'
+        )
+        Title.objects.create(
+            name='Мир Дикого Запада', year=2016, description='Сериал'
+        )
+
+        assert set(self.search(client, 'МИР')) == {
+            'Война и мир', 'Мир Дикого Запада'
+        }, 'Проверьте, что поиск `?q=` не зависит от регистра.'
+        assert self.search(client, 'войн') == [
+            'Война и мир', 'Анна Каренина'
+        ], (
+            'Проверьте, что совпадения в названии ранжируются выше '
+            'совпадений в описании, а последнее слово ищется по префиксу.'
+        )
+        assert self.search(client, '"*)(') == []
+
+    def test_02_search_index_follows_changes(self, client):
+        from reviews.models import Title
+
+        title = Title.objects.create(
+            name='Старое название', year=2000, description=''
+        )
+        title.name = 'Новое название'
+        title.save()
+        assert self.search(client, 'старое') == []
+        assert self.search(client, 'новое') == ['Новое название'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        title.delete()
+        assert self.search(client, 'новое') == [], (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
+
+    def test_03_search_index_follows_bulk_writes(self, client):
+        from reviews.models import Title
+
+        Title.objects.bulk_create([
+            Title(name='Пикник на обочине', year=1972, description=''),
+            Title(name='Трудно быть богом', year=1964, description=''),
+        ])
+        assert self.search(client, 'пикник') == ['Пикник на обочине'], (
+            'Проверьте, что bulk_create попадает в поисковый индекс.'
+        )
+        Title.objects.filter(name='Пикник на обочине').update(
+            name='Сталкер'
+        )
+        assert self.search(client, 'пикник') == []
+        assert self.search(client, 'сталкер') == ['Сталкер'], (
+            'Проверьте, что QuerySet.update обновляет поисковый индекс.'
+        )
+        title = Title.objects.get(name='Трудно быть богом')
+        title.description = 'Дон Румата'
+        Title.objects.bulk_update([title], ['description'])
+        assert self.search(client, 'румата') == ['Трудно быть богом'], (
+            'Проверьте, что bulk_update обновляет поисковый индекс.'
+        )
+        Title.objects.filter(name='Сталкер').delete()
+        assert self.search(client, 'сталкер') == []
+
+    def test_04_triggers_restored_after_migrate(self, client):
+        from django.db import connection
+
+        from reviews.models import Title
+        from reviews.search import (
+            TITLE_SEARCH_TRIGGERS, restore_title_search_triggers
+        )
+
+        with connection.cursor() as cursor:
+            for name in TITLE_SEARCH_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER {name}')
+        Title.objects.create(name='Солярис', year=1961, description='')
+        assert restore_title_search_triggers(), (
+            'Проверьте, что пропавшие триггеры поискового индекса '
+            'восстанавливаются.'
+        )
+        assert not restore_title_search_triggers()
+        assert self.search(client, 'солярис') == ['Солярис'], (
+            'Проверьте, что после восстановления триггеров индекс '
+            'пересобирается.'
+        )
+
+    def test_05_yo_matches_ye(self, client):
+        from django.db import connection
+
+        from reviews.models import Title
+        from reviews.search import rebuild_title_search_index
+
+        title = Title.objects.create(
+            name='Ёлка', year=2010, description='Зелёная комедия'
+        )
+        for query in ('елка', 'ЁЛКА', 'зеленая', 'зелёная ком'):
+            assert self.search(client, query) == ['Ёлка'], (
+                'Проверьте, что поиск `?q=` не различает «е» и «ё»: '
+                f'запрос `{query}`.'
+            )
+        title.name = 'Ёжик в тумане'
+        title.save()
+        assert self.search(client, 'елка') == []
+        assert self.search(client, 'ежик') == ['Ёжик в тумане']
+        assert rebuild_title_search_index() == 1
+        assert self.search(client, 'ежик') == ['Ёжик в тумане'], (
+            'Проверьте, что пересборка индекса заменяет «ё», как триггеры.'
+        )
+        title.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO reviews_title_fts(reviews_title_fts) '
+                "VALUES ('integrity-check')"
+            )
+            cursor.execute('SELECT COUNT(*) FROM reviews_title_fts_docsize')
+            assert cursor.fetchone()[0] == 0
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12SearchKeys:
+
+    GENRES_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def names(self, client, url, params, key='name'):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return {item[key] for item in response.json()['results']}
+
+    def test_01_cyrillic_case_insensitive(self, client, admin_client):
+        from reviews.models import Genre, Title
+
+        Genre.objects.create(name='Ёлочные сказки', slug='tales')
+        Genre.objects.create(name='Драма', slug='drama')
+        Title.objects.create(name='Крепкий Орешек', year=1988, description='')
+
+        assert self.names(client, self.GENRES_URL, {'search': 'ЕЛОЧ'}) == {
+            'Ёлочные сказки'
+        }, (
+            f'Проверьте, что поиск `{self.GENRES_URL}?search=` не зависит '
+            'от регистра кириллицы.'
+        )
+        assert self.names(client, self.GENRES_URL, {'search': 'рама'}) == {
+            'Драма'
+        }, (
+            f'Проверьте, что поиск `{self.GENRES_URL}?search=` находит '
+            'подстроку в любом месте названия.'
+        )
+        assert self.names(
+            client, self.GENRES_URL, {'search': 'сказки ёлоч'}
+        ) == {'Ёлочные сказки'}, (
+            f'Проверьте, что поиск `{self.GENRES_URL}?search=` ищет каждое '
+            'слово запроса отдельно.'
+        )
+        assert self.names(client, self.GENRES_URL, {'prefix': 'рама'}) == (
+            set()
+        )
+        assert self.names(client, self.GENRES_URL, {'prefix': 'ДР'}) == {
+            'Драма'
+        }, (
+            f'Проверьте, что `{self.GENRES_URL}?prefix=` ищет по началу '
+            'названия без учёта регистра.'
+        )
+        assert self.names(client, self.TITLES_URL, {'search': 'орешек'}) == {
+            'Крепкий Орешек'
+        }
+        assert self.names(client, self.TITLES_URL, {'prefix': 'крепк'}) == {
+            'Крепкий Орешек'
+        }
+        assert self.names(client, self.TITLES_URL, {'name': 'ОРЕШ'}) == {
+            'Крепкий Орешек'
+        }, (
+            f'Проверьте, что фильтр `{self.TITLES_URL}?name=` не зависит '
+            'от регистра кириллицы.'
+        )
+        assert self.names(
+            admin_client, self.USERS_URL, {'search': 'tadm'}, 'username'
+        ) == {'TestAdmin'}
+        assert self.names(
+            admin_client, self.USERS_URL, {'prefix': 'testad'}, 'username'
+        ) == {'TestAdmin'}
+
+    def test_02_prefix_search_uses_index(self):
+        from api.filters import startswith_key
+        from reviews.models import Genre
+
+        plan = Genre.objects.filter(startswith_key('name_key', 'Др')).explain()
+        assert 'USING INDEX' in plan, (
+            'Проверьте, что поиск по началу названия использует индекс '
+            f'ключевого поля. План запроса: {plan}'
+        )
@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Autocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/autocomplete/'
+
+    def complete(self, client, query, **params):
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': query, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.AUTOCOMPLETE_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_autocomplete(self, client):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        Genre.objects.create(name='Фэнтези', slug='fantasy')
+        Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Фарго', year=1996, description='', category=category
+        )
+        Title.objects.create(name='Форрест Гамп', year=1994, description='')
+
+        data = self.complete(client, 'ф')
+        assert data == {
+            'titles': [
+                {'id': title.id, 'name': 'Фарго', 'year': 1996},
+                {'id': title.id + 1, 'name': 'Форрест Гамп', 'year': 1994},
+            ],
+            'genres': [{'name': 'Фэнтези', 'slug': 'fantasy'}],
+            'categories': [{'name': 'Фильмы', 'slug': 'films'}],
+        }, (
+            f'Проверьте, что `{self.AUTOCOMPLETE_URL}?q=` возвращает '
+            'произведения, жанры и категории, название которых начинается '
+            'с запроса.'
+        )
+        assert self.complete(client, 'ФОР', limit=1)['titles'] == [
+            {'id': title.id + 1, 'name': 'Форрест Гамп', 'year': 1994}
+        ]
+
+    def test_02_autocomplete_follows_changes(self, client):
+        from reviews.models import Genre
+
+        genre = Genre.objects.create(name='Вестерн', slug='western')
+        assert self.complete(client, 'вест')['genres'] == [
+            {'name': 'Вестерн', 'slug': 'western'}
+        ]
+
+        genre.name = 'Детектив'
+        genre.save()
+        assert self.complete(client, 'вест')['genres'] == [], (
+            'Проверьте, что индекс автодополнения обновляется при '
+            'изменении объекта.'
+        )
+        assert self.complete(client, 'дет')['genres'] == [
+            {'name': 'Детектив', 'slug': 'western'}
+        ]
+
+        genre.delete()
+        assert self.complete(client, 'дет')['genres'] == [], (
+            'Проверьте, что индекс автодополнения обновляется при '
+            'удалении объекта.'
+        )
+
+    def test_03_autocomplete_validation(self, client):
+        response = client.get(self.AUTOCOMPLETE_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': 'а', 'limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_version_invalidates_other_processes(self, client,
+                                                    monkeypatch):
+        from reviews.autocomplete import autocomplete
+        from reviews.models import Title
+        from reviews.versions import NAMES, bump_versions
+
+        assert self.complete(client, 'зел')['titles'] == []
+        # Запись из другого процесса: без сигналов этого процесса,
+        # но со сдвигом счётчика версий.
+        Title.objects.bulk_create([Title(name='Зелёная миля', year=1999)])
+        bump_versions(NAMES)
+        assert self.complete(client, 'зел')['titles'] == []
+        monkeypatch.setattr(autocomplete, 'check_interval', 0)
+        assert [
+            title['name'] for title in self.complete(client, 'зел')['titles']
+        ] == ['Зелёная миля'], (
+            'Проверьте, что индекс автодополнения перестраивается, когда '
+            'версия произведений изменилась в другом процессе.'
+        )
+
+    def test_05_reviews_keep_index(self, client, admin, monkeypatch):
+        from reviews import autocomplete as module
+        from reviews.models import Genre, Review, Title
+
+        builds = []
+
+        class CountingIndex(module.PrefixIndex):
+            def __init__(self, *args, **kwargs):
+                builds.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(module, 'PrefixIndex', CountingIndex)
+        monkeypatch.setattr(module.autocomplete, 'check_interval', 0)
+        title = Title.objects.create(name='Сталкер', year=1979)
+        assert self.complete(client, 'ста')['titles']
+        built = len(builds)
+        review = Review.objects.create(
+            title=title, author=admin, text='текст', score=9
+        )
+        review.score = 3
+        review.save()
+        assert self.complete(client, 'ста')['titles']
+        assert len(builds) == built, (
+            'Проверьте, что отзывы и рейтинги не перестраивают индекс '
+            'автодополнения.'
+        )
+        Title.objects.create(name='Солярис', year=1972)
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+        completed = self.complete(client, 'с')
+        assert len(completed['titles']) == 2
+        assert completed['genres'] == []
+        assert self.complete(client, 'фан')['genres']
+        assert len(builds) == built, (
+            'Проверьте, что изменения в этом процессе вносятся в индекс '
+            'без его перестроения.'
+        )
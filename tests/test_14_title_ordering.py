@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+
+def create_rated_titles():
+    from reviews.models import Title
+
+    titles = []
+    for name, year, rating, review_count in (
+        ('Альфа', 1990, 7, 3),
+        ('Бета', 2000, 9, 1),
+        ('Гамма', 2010, None, 0),
+        ('Дельта', 2020, 5, 10),
+    ):
+        title = Title.objects.create(name=name, year=year, description='')
+        Title.objects.filter(pk=title.pk).update(
+            rating=rating, review_count=review_count
+        )
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ordering(self, client):
+        create_rated_titles()
+        assert self.names(client, ordering='-rating') == [
+            'Бета', 'Альфа', 'Дельта', 'Гамма'
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?ordering=-rating` сортирует '
+            'произведения по убыванию рейтинга.'
+        )
+        assert self.names(client, ordering='-review_count') == [
+            'Дельта', 'Альфа', 'Бета', 'Гамма'
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?ordering=-review_count` '
+            'сортирует произведения по убыванию количества отзывов.'
+        )
+        assert self.names(client) == ['Альфа', 'Бета', 'Гамма', 'Дельта'], (
+            'Проверьте, что по умолчанию произведения отсортированы '
+            'по названию.'
+        )
+
+    def test_02_range_filters(self, client):
+        create_rated_titles()
+        assert self.names(client, year_min=2000, year_max=2010) == [
+            'Бета', 'Гамма'
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?year_min=&year_max=` '
+            'фильтрует произведения по диапазону годов.'
+        )
+        assert self.names(client, rating_min=7) == ['Альфа', 'Бета'], (
+            f'Проверьте, что `{self.TITLES_URL}?rating_min=` фильтрует '
+            'произведения по минимальному рейтингу.'
+        )
+
+    def test_03_ordering_uses_index(self):
+        from reviews.models import Title
+
+        for ordering, index in (
+            (('-rating', '-id'), 'title_rating_idx'),
+            (('review_count', 'id'), 'title_review_count_idx'),
+        ):
+            plan = Title.objects.order_by(*ordering)[:5].explain()
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что сортировка {ordering} читает индекс '
+                f'`{index}` без сортировки в памяти. План запроса: {plan}'
+            )
@@ -0,0 +1,97 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Подзапрос prefetch_related сортирует жанры одной страницы произведений:
+# объём сортировки ограничен размером страницы, а не таблицы.
+BOUNDED_SORT_MARKERS = ('_prefetch_related_val_',)
+# Списки категорий и жанров отдаются из снимка в памяти без запросов
+# к БД (test_19_group_snapshots) и здесь не проверяются.
+
+
+def get_plans(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+            plans.append(
+                (query['sql'], [row[-1] for row in cursor.fetchall()])
+            )
+    return plans
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15QueryPlans:
+
+    @pytest.fixture
+    def urls(self, django_user_model):
+        from reviews.models import (
+            Category, Comment, Genre, GenreTitle, Review, Title
+        )
+
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Фильм', year=2000, description='', category=category
+        )
+        GenreTitle.objects.create(title=title, genre=genre)
+        review = Review.objects.create(
+            title=title, author=author, text='текст', score=5
+        )
+        Comment.objects.create(review=review, author=author, text='текст')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        return (
+            ('/api/v1/titles/', 'title_name_idx', True),
+            ('/api/v1/titles/?cursor=', 'title_name_idx', True),
+            (
+                '/api/v1/titles/?genre=drama',
+                'genretitle_genre_title_idx',
+                False
+            ),
+            (
+                '/api/v1/titles/?category=films&year=2000',
+                'title_category_year_idx',
+                False
+            ),
+            ('/api/v1/titles/?ordering=-rating', 'title_rating_idx', True),
+            (reviews_url, 'review_title_pub_date_idx', True),
+            (f'{reviews_url}?cursor=', 'review_title_pub_date_idx', True),
+            (comments_url, 'comment_review_pub_date_idx', True),
+        )
+
+    def test_01_hot_paths_use_indexes(self, client, urls):
+        for url, index, sorted_by_index in urls:
+            plans = get_plans(client, url)
+            assert any(index in '\n'.join(plan) for _, plan in plans), (
+                f'Проверьте, что запрос к `{url}` использует индекс '
+                f'`{index}`. Планы запросов: {plans}'
+            )
+            for sql, plan in plans:
+                for step in plan:
+                    assert not re.fullmatch(r'SCAN \w+', step), (
+                        f'Запрос к `{url}` читает таблицу целиком без '
+                        f'индекса: {sql}\n{plan}'
+                    )
+                if not sorted_by_index or any(
+                    marker in sql for marker in BOUNDED_SORT_MARKERS
+                ):
+                    continue
+                assert not any('TEMP B-TREE' in step for step in plan), (
+                    f'Запрос к `{url}` сортирует строки во временном '
+                    f'B-дереве вместо индекса: {sql}\n{plan}'
+                )
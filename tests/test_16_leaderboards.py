@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def rate(title, author, score):
+    from reviews.models import Review
+
+    return Review.objects.create(
+        title=title, author=author, text='текст', score=score
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Leaderboards:
+
+    CATEGORY_TOP_URL = '/api/v1/categories/{slug}/top/'
+    GENRE_TOP_URL = '/api/v1/genres/{slug}/top/'
+
+    def top(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [(title['name'], title['rating']) for title in response.json()]
+
+    def test_01_top_follows_reviews(self, client, django_user_model):
+        from reviews.models import Category, Genre, GenreTitle, Title
+
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        titles = [
+            Title.objects.create(
+                name=name, year=2000, description='', category=category
+            )
+            for name in ('Альфа', 'Бета', 'Гамма')
+        ]
+        GenreTitle.objects.create(title=titles[0], genre=genre)
+        rate(titles[0], author, 6)
+        review = rate(titles[1], author, 8)
+
+        category_url = self.CATEGORY_TOP_URL.format(slug='films')
+        genre_url = self.GENRE_TOP_URL.format(slug='drama')
+        assert self.top(client, category_url) == [
+            ('Бета', 8), ('Альфа', 6)
+        ], (
+            f'Проверьте, что `{category_url}` возвращает произведения '
+            'категории с рейтингом по убыванию рейтинга.'
+        )
+        assert self.top(client, genre_url) == [('Альфа', 6)]
+
+        review.score = 3
+        review.save()
+        rate(titles[2], author, 10)
+        assert self.top(client, category_url) == [
+            ('Гамма', 10), ('Альфа', 6), ('Бета', 3)
+        ], (
+            'Проверьте, что доска лучших произведений обновляется при '
+            'изменении отзывов.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.top(client, category_url)
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что чтение доски не обращается к таблице отзывов.'
+
+        response = client.get(self.CATEGORY_TOP_URL.format(slug='missing'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_board_is_bounded(self):
+        from reviews.leaderboards import Board
+
+        def row(pk, rating):
+            return {'id': pk, 'rating': rating}
+
+        board = Board([row(1, 5), row(2, 7)], size=2)
+        assert board.update(3, row(3, 9))
+        assert [item['id'] for item in board.top()] == [3, 2], (
+            'Проверьте, что доска хранит не больше заданного числа '
+            'лучших произведений.'
+        )
+        assert board.update(4, row(4, 1))
+        assert [item['id'] for item in board.top()] == [3, 2]
+        assert not board.update(2, row(2, 1)), (
+            'Проверьте, что доска требует перестроения, если произведение '
+            'с неё может быть вытеснено неизвестным ей произведением.'
+        )
+        assert board.update(2, row(2, 8))
+        assert [item['id'] for item in board.top()] == [3, 2]
+
+    def test_03_same_rating_update_of_lowest(self):
+        from reviews.leaderboards import Board
+
+        def row(pk, rating, review_count):
+            return {'id': pk, 'rating': rating, 'review_count': review_count}
+
+        board = Board([row(3, 9, 1), row(2, 7, 1)], size=2)
+        assert board.update(2, row(2, 7, 2)), (
+            'Проверьте, что изменение произведения в вершине полной доски '
+            'без смены рейтинга не требует перестроения доски.'
+        )
+        assert board.top() == [row(3, 9, 1), row(2, 7, 2)]
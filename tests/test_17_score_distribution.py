@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ScoreDistribution:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/score-distribution/'
+
+    def get_distribution(self, client, title_id):
+        url = self.URL_TEMPLATE.format(title_id=title_id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_distribution(self, client, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        empty = self.get_distribution(client, title.id)
+        assert empty['count'] == 0 and empty['median'] is None
+        assert [bar['count'] for bar in empty['distribution']] == [0] * 10
+
+        reviews = [
+            Review.objects.create(
+                title=title,
+                author=django_user_model.objects.create_user(
+                    username=f'user{number}',
+                    email=f'user{number}@yamdb.fake'
+                ),
+                text='текст',
+                score=score
+            )
+            for number, score in enumerate((2, 4, 4, 4, 5, 5, 7, 9))
+        ]
+        data = self.get_distribution(client, title.id)
+        assert [bar['count'] for bar in data['distribution']] == [
+            0, 1, 0, 3, 2, 0, 1, 0, 1, 0
+        ], (
+            'Проверьте, что распределение оценок содержит количество '
+            'отзывов с каждой оценкой от 1 до 10.'
+        )
+        assert (data['count'], data['mean'], data['median'], data['stddev']) == (
+            8, 5.0, 4.5, 2.0
+        ), (
+            'Проверьте, что эндпоинт возвращает количество, среднее, '
+            'медиану и стандартное отклонение оценок.'
+        )
+        assert data['percentiles'] == {'10': 2, '25': 4, '75': 5, '90': 9}
+
+        reviews[-1].score = 3
+        reviews[-1].save()
+        reviews[0].delete()
+        data = self.get_distribution(client, title.id)
+        assert [bar['count'] for bar in data['distribution']] == [
+            0, 0, 1, 3, 2, 0, 1, 0, 0, 0
+        ], (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзывов.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_distribution(client, title.id)
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что распределение не читает таблицу отзывов.'
+
+        response = client.get(self.URL_TEMPLATE.format(title_id=title.id + 1))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_recount(self, client, django_user_model):
+        from reviews.models import Review, ScoreCount, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text='текст', score=8
+        )
+        ScoreCount.objects.all().delete()
+
+        call_command('recount_ratings')
+        data = self.get_distribution(client, title.id)
+        assert data['distribution'][7] == {'score': 8, 'count': 1}, (
+            'Проверьте, что команда recount_ratings пересобирает '
+            'распределение оценок.'
+        )
@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ConditionalGet:
+
+    def get(self, client, url, etag=None):
+        headers = {} if etag is None else {'HTTP_IF_NONE_MATCH': etag}
+        return client.get(url, **headers)
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(client, url, etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        # Версии и проверка существования объекта или его родителя.
+        assert len(context.captured_queries) <= 2, (
+            f'Проверьте, что ответ 304 на запрос к `{url}` отдаётся по '
+            'версиям без выборки и сериализации объектов.'
+        )
+        assert not response.content
+
+    def test_01_etag_follows_writes(self, client, user_client, admin):
+        from reviews.models import Comment, Genre, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = Review.objects.create(
+            title=title, author=admin, text='текст', score=5
+        )
+        comment = Comment.objects.create(
+            review=review, author=admin, text='текст'
+        )
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            reviews_url,
+            f'{reviews_url}{review.id}/',
+            comments_url,
+            f'{comments_url}{comment.id}/',
+        )
+        etags = {}
+        for url in urls:
+            response = self.get(client, url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `ETag`.'
+            )
+            etags[url] = response['ETag']
+            self.assert_not_modified(client, url, etags[url])
+        assert self.get(client, reviews_url).has_header('Last-Modified'), (
+            'Проверьте, что список отзывов содержит заголовок '
+            '`Last-Modified`.'
+        )
+
+        response = user_client.post(
+            reviews_url, data={'text': 'новый', 'score': 9}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        for url in urls[:3]:
+            assert self.get(
+                client, url, etags[url]
+            ).status_code == HTTPStatus.OK, (
+                f'Проверьте, что после нового отзыва ETag `{url}` меняется.'
+            )
+        for url in urls[3:]:
+            self.assert_not_modified(client, url, etags[url])
+
+        etag = self.get(client, urls[1])['ETag']
+        Genre.objects.create(name='Драма', slug='drama')
+        assert self.get(client, urls[1], etag).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанров и категорий меняет ETag '
+            'произведений.'
+        )
+        comment.text = 'изменён'
+        comment.save()
+        for url in urls[4:]:
+            assert self.get(
+                client, url, etags[url]
+            ).status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения комментария ETag `{url}` '
+                'меняется.'
+            )
+
+    def test_02_missing_objects_are_not_modified(self, client, admin):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = Review.objects.create(
+            title=title, author=admin, text='текст', score=5
+        )
+        Comment.objects.create(review=review, author=admin, text='текст')
+        missing = 10 ** 6
+        urls = (
+            f'/api/v1/titles/{missing}/',
+            f'/api/v1/titles/{missing}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{missing}/',
+            f'/api/v1/titles/{missing}/reviews/{review.id}/',
+            f'/api/v1/titles/{title.id}/reviews/{missing}/comments/',
+            f'/api/v1/titles/{missing}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            f'{missing}/',
+        )
+        for url in urls:
+            for etag in ('*', '"json-0-0"'):
+                response = self.get(client, url, etag)
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что GET-запрос к `{url}` с `If-None-Match: '
+                    f'{etag}` возвращает 404 для несуществующего объекта.'
+                )
+        response = self.get(client, '/api/v1/titles/abc/', '*')
+        assert response.status_code == HTTPStatus.NOT_FOUND
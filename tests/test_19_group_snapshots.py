@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19GroupSnapshots:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def get(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_lists_without_queries(self, client, admin_client):
+        from reviews.models import Category, Genre
+
+        Category.objects.create(name='Фильмы', slug='films')
+        Category.objects.create(name='Книги', slug='books')
+        Genre.objects.create(name='Драма', slug='drama')
+        self.get(client, self.CATEGORIES_URL)
+        self.get(client, self.GENRES_URL)
+        client.get(f'{self.GENRES_URL}drama/top/')
+
+        with CaptureQueriesContext(connection) as context:
+            categories = self.get(client, self.CATEGORIES_URL)
+            found = self.get(client, self.CATEGORIES_URL, search='ФИЛ')
+            genres = self.get(client, self.GENRES_URL)
+            top = client.get(f'{self.GENRES_URL}drama/top/')
+        assert top.status_code == HTTPStatus.OK
+        assert not context.captured_queries, (
+            f'Проверьте, что `{self.CATEGORIES_URL}` и `{self.GENRES_URL}` '
+            'отдаются из снимка в памяти без запросов к БД.'
+        )
+        assert categories['count'] == 2 and categories['results'] == [
+            {'name': 'Книги', 'slug': 'books'},
+            {'name': 'Фильмы', 'slug': 'films'},
+        ]
+        assert found['results'] == [{'name': 'Фильмы', 'slug': 'films'}]
+        assert genres['results'] == [{'name': 'Драма', 'slug': 'drama'}]
+
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get(client, self.CATEGORIES_URL)['count'] == 3, (
+            'Проверьте, что снимок категорий сбрасывается при добавлении '
+            'категории.'
+        )
+        response = admin_client.delete(f'{self.CATEGORIES_URL}music/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get(client, self.CATEGORIES_URL)['count'] == 2, (
+            'Проверьте, что снимок категорий сбрасывается при удалении '
+            'категории.'
+        )
+
+    def test_02_version_invalidates_other_processes(self, client,
+                                                    monkeypatch):
+        from reviews.models import Category
+        from reviews.snapshots import snapshots
+        from reviews.versions import GROUPS, bump_versions
+
+        assert self.get(client, self.CATEGORIES_URL)['count'] == 0
+        # Запись из другого процесса: без сигналов этого процесса,
+        # но со сдвигом счётчика версий.
+        Category.objects.bulk_create([Category(name='Фильмы', slug='films')])
+        bump_versions(GROUPS)
+        assert self.get(client, self.CATEGORIES_URL)['count'] == 0
+        monkeypatch.setattr(snapshots, 'check_interval', 0)
+        assert self.get(client, self.CATEGORIES_URL)['count'] == 1, (
+            'Проверьте, что снимок перестраивается, когда версия категорий '
+            'и жанров изменилась в другом процессе.'
+        )
+
+    def test_03_title_filters_use_snapshot(self, client):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        Title.objects.create(
+            name='Фильм', year=2000, description='', category=category
+        )
+        Title.objects.create(name='Книга', year=2000, description='')
+        results = self.get(client, '/api/v1/titles/', category='films')
+        assert [title['name'] for title in results['results']] == ['Фильм']
+        results = self.get(client, '/api/v1/titles/', category='missing')
+        assert results['results'] == []
+
+    def test_04_nested_representations_follow_changes(self, client):
+        from reviews.models import Category, Genre, GenreTitle, Title
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Фильм', year=2000, description='', category=category
+        )
+        GenreTitle.objects.create(title=title, genre=genre)
+        url = f'/api/v1/titles/{title.id}/'
+        data = self.get(client, url)
+        assert data['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert data['category'] == {'name': 'Фильмы', 'slug': 'films'}
+
+        genre.name = 'Комедия'
+        genre.save()
+        assert self.get(client, url)['genre'] == [
+            {'name': 'Комедия', 'slug': 'drama'}
+        ], (
+            'Проверьте, что представление жанра в произведении обновляется '
+            'при изменении жанра.'
+        )
+
+    def test_05_etag_follows_snapshot(self, client, monkeypatch):
+        from reviews.models import Category, Title
+        from reviews.snapshots import snapshots
+        from reviews.versions import GROUPS, bump_versions
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        title = Title.objects.create(
+            name='Фильм', year=2000, description='', category=category
+        )
+        url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(url)['ETag']
+        # Запись из другого процесса: снимок этого процесса ещё не сверен.
+        Category.objects.filter(pk=category.pk).update(name='Кино')
+        bump_versions(GROUPS)
+        response = client.get(url)
+        assert response.json()['category']['name'] == 'Фильмы'
+        assert response['ETag'] == etag, (
+            'Проверьте, что ETag произведения строится по версии снимка '
+            'категорий и жанров, из которого взято тело ответа.'
+        )
+        monkeypatch.setattr(snapshots, 'check_interval', 0)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category']['name'] == 'Кино'
+        assert response['ETag'] != etag
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_reviewed_title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FastSerialization:
+
+    def assert_same_json(self, client, url, serializer_class, queryset):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        expected = serializer_class(queryset, many=True).data
+        assert (
+            JSONRenderer().render(response.data['results'])
+            == JSONRenderer().render(expected)
+        ), (
+            f'Проверьте, что список `{url}` выводится так же, как '
+            f'`{serializer_class.__name__}`.'
+        )
+
+    def test_01_lists_match_serializers(self, client, django_user_model):
+        from api.serializers import (
+            CommentSerializer, ReviewSerializer, TitleReadSerializer
+        )
+        from reviews.models import Title
+
+        title, review = create_reviewed_title(django_user_model)
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('name', 'id')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        for url, serializer_class, queryset in (
+            ('/api/v1/titles/', TitleReadSerializer, titles),
+            ('/api/v1/titles/?cursor=', TitleReadSerializer, titles),
+            (
+                reviews_url, ReviewSerializer,
+                title.reviews.order_by('-pub_date', 'id')
+            ),
+            (
+                f'{reviews_url}{review.id}/comments/?cursor=',
+                CommentSerializer,
+                review.comments.order_by('-pub_date', 'id')
+            ),
+        ):
+            self.assert_same_json(client, url, serializer_class, queryset)
+
+    def test_02_plans(self):
+        from api.plans import get_plan
+        from api.serializers import (
+            CommentSerializer,
+            ReviewSerializer,
+            TitleCreateSerializer,
+            TitleReadSerializer,
+            UserSerializer
+        )
+
+        for serializer_class in (
+            TitleReadSerializer, ReviewSerializer, CommentSerializer,
+            UserSerializer
+        ):
+            assert get_plan(serializer_class) is not None, (
+                f'Проверьте, что для `{serializer_class.__name__}` '
+                'строится план вывода.'
+            )
+        assert get_plan(TitleCreateSerializer) is None
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21SparseFields:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_sparse_fields(self, client, admin_client, admin):
+        from reviews.models import (
+            Category, Comment, Genre, GenreTitle, Review, Title
+        )
+
+        category = Category.objects.create(name='Фильмы', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Фильм', year=2000, description='Описание',
+            category=category
+        )
+        GenreTitle.objects.create(title=title, genre=genre)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=7
+        )
+        Comment.objects.create(review=review, author=admin, text='Текст')
+
+        data, queries = self.get(client, '/api/v1/titles/?fields=name,id')
+        assert data['results'] == [{'id': title.id, 'name': 'Фильм'}], (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля в порядке сериализатора.'
+        )
+        assert not any(
+            'description' in sql or 'rating' in sql or 'genretitle' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что незапрошенные поля не выбираются из БД, '
+            'а жанры без поля `genre` не загружаются.'
+        )
+
+        data, queries = self.get(
+            client, f'/api/v1/titles/{title.id}/?fields=name,genre'
+        )
+        assert data == {
+            'name': 'Фильм', 'genre': [{'name': 'Драма', 'slug': 'drama'}]
+        }
+        assert not any('"description"' in sql for sql in queries)
+        assert not any('reviews_category' in sql for sql in queries), (
+            'Проверьте, что категория без поля `category` не '
+            'присоединяется к запросу.'
+        )
+
+        data, queries = self.get(
+            client, f'/api/v1/titles/{title.id}/?fields=name'
+        )
+        assert data == {'name': 'Фильм'}
+        assert not any(
+            'reviews_category' in sql or 'genretitle' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что связи, нужные только незапрошенным полям, '
+            'не загружаются и для одного объекта.'
+        )
+
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        data, queries = self.get(client, f'{reviews_url}?fields=score,author')
+        assert data['results'] == [{'author': 'TestAdmin', 'score': 7}]
+        assert not any('"text"' in sql for sql in queries)
+        data, _ = self.get(
+            client, f'{reviews_url}{review.id}/comments/?fields=text'
+        )
+        assert data['results'] == [{'text': 'Текст'}]
+
+        data, queries = self.get(admin_client, '/api/v1/users/?fields=role')
+        assert data['results'] == [{'role': 'admin'}]
+        assert not any('"bio"' in sql for sql in queries[1:])
+
+    def test_02_unknown_fields(self, client):
+        response = client.get('/api/v1/titles/?fields=name,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестных полей в `?fields=` '
+            'возвращает ответ со статусом 400.'
+        )
@@ -0,0 +1,70 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+
+DATA = {
+    'name': 'Фильм ',
+    'pub_date': datetime.datetime(
+        2020, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc
+    ),
+    'day': datetime.date(2020, 1, 2),
+    'price': Decimal('9.50'),
+    'uuid': uuid.UUID(int=1),
+    'scores': {1: 2},
+    'genres': [{'name': 'Драма', 'slug': 'drama'}],
+    'rating': None,
+}
+
+
+class Test22JSONRenderer:
+
+    def test_01_output_matches_json_renderer(self):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, что и '
+            'JSONRenderer, включая даты, Decimal и UUID.'
+        )
+        assert FastJSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(DATA, 'application/json; indent=4')
+        assert FastJSONRenderer().render(None) == b''
+        huge = {'value': 2 ** 70}
+        assert FastJSONRenderer().render(huge) == JSONRenderer().render(huge)
+
+    def test_02_fallback_without_orjson(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(
+            DATA
+        ) == JSONRenderer().render(DATA), (
+            'Проверьте, что без orjson FastJSONRenderer использует '
+            'стандартный json.'
+        )
+        assert parsers.FastJSONParser().parse(
+            BytesIO(b'{"score": 5}')
+        ) == {'score': 5}
+
+    def test_03_parser(self):
+        from api.parsers import FastJSONParser
+
+        assert FastJSONParser().parse(
+            BytesIO('{"text": "Отзыв", "score": 5}'.encode())
+        ) == {'text': 'Отзыв', 'score': 5}
+        for body in (b'{"score": ', b'{"score": NaN}'):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+        assert FastJSONParser().parse(
+            BytesIO('{"text": "Отзыв"}'.encode('cp1251')),
+            parser_context={'encoding': 'cp1251'}
+        ) == {'text': 'Отзыв'}
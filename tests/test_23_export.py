@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviewed_title
+
+
+def read(response):
+    content = b''.join(response.streaming_content)
+    if response.get('Content-Encoding') == 'gzip':
+        content = gzip.decompress(content)
+    return content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Export:
+
+    URL_TEMPLATE = '/api/v1/export/{name}'
+
+    def test_01_permissions(self, client, user_client, admin_client):
+        url = self.URL_TEMPLATE.format(name='titles.ndjson')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что выгрузка `{url}` недоступна анониму.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что выгрузка `{url}` недоступна пользователю.'
+        )
+        for name in ('titles.xml', 'users.csv'):
+            response = admin_client.get(self.URL_TEMPLATE.format(name=name))
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_titles(self, admin_client, django_user_model):
+        create_reviewed_title(django_user_model)
+        url = self.URL_TEMPLATE.format(name='titles.ndjson')
+        response = admin_client.get(url, HTTP_ACCEPT='application/x-ndjson')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что администратору доступна выгрузка `{url}`.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        assert rows == [
+            {
+                'id': rows[0]['id'], 'name': 'Фильм', 'year': 2000,
+                'description': 'Описание', 'rating': 6, 'review_count': 3,
+                'category': 'films', 'genre': ['action', 'drama'],
+            },
+            {
+                'id': rows[1]['id'], 'name': 'Книга', 'year': 1990,
+                'description': '', 'rating': None, 'review_count': 0,
+                'category': None, 'genre': [],
+            },
+        ], (
+            'Проверьте, что выгрузка произведений содержит рейтинг, slug '
+            'категории и slug жанров.'
+        )
+
+        url = self.URL_TEMPLATE.format(name='titles.csv')
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что выгрузка сжимается gzip, если клиент его '
+            'принимает.'
+        )
+        rows = list(csv.DictReader(io.StringIO(read(response))))
+        assert [(row['name'], row['genre']) for row in rows] == [
+            ('Фильм', 'action drama'), ('Книга', '')
+        ]
+
+    def test_03_reviews_chunks(self, admin_client, django_user_model):
+        from api.exports import ReviewExport, TitleExport
+        from reviews.models import Title
+
+        create_reviewed_title(django_user_model)
+        url = self.URL_TEMPLATE.format(name='reviews.ndjson')
+        rows = [
+            json.loads(line)
+            for line in read(admin_client.get(url)).splitlines()
+        ]
+        assert [(row['author'], row['score']) for row in rows] == [
+            ('user0', 5), ('user1', 6), ('user2', 7)
+        ]
+        assert rows[0]['pub_date'].endswith('Z')
+
+        for number in range(5):
+            Title.objects.create(name=f'Книга {number}', year=2000)
+        with CaptureQueriesContext(connection) as context:
+            chunks = list(TitleExport(chunk_size=2).chunks())
+        assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+        assert len(context.captured_queries) == 1 + len(chunks), (
+            'Проверьте, что выгрузка читает жанры одним запросом на порцию.'
+        )
+        assert len(list(ReviewExport(chunk_size=2).chunks())) == 2
+
+    def test_04_accept_encoding_weights(self, admin_client):
+        from api.exports import accepts_gzip
+
+        for header in ('gzip', 'br, GZIP;q=0.5', '*', 'identity, *;q=1'):
+            assert accepts_gzip(header), header
+        for header in ('', 'gzip;q=0', 'br, gzip; q=0.0', '*;q=0',
+                       'gzip;q=0, *', 'gzips'):
+            assert not accepts_gzip(header), (
+                'Проверьте, что gzip с q=0 не считается принятым: '
+                f'`Accept-Encoding: {header}`.'
+            )
+        url = self.URL_TEMPLATE.format(name='titles.csv')
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        assert not response.has_header('Content-Encoding')
@@ -0,0 +1,89 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tests.utils import write_csv
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkLoad:
+
+    def load(self, path, batch_size=2):
+        out = StringIO()
+        call_command(
+            'load_csv', path, '--bulk', f'--batch-size={batch_size}',
+            stdout=out
+        )
+        return out.getvalue()
+
+    def test_01_bulk_load(self, tmp_path, django_user_model):
+        from reviews.models import Review, ScoreCount, Title
+        from reviews.search import search_titles
+
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                id=number, username=f'user{number}',
+                email=f'user{number}@yamdb.fake'
+            )
+            for number in range(1, 4)
+        )
+        self.load(write_csv(tmp_path, 'titles.csv', [
+            'id,name,year', '1,Фильм,2000', '2,Книга,1990', '3,Песня,2010'
+        ]))
+        output = self.load(write_csv(tmp_path, 'review.csv', [
+            'id,title_id,text,author_id,score',
+            '1,1,текст,1,4', '2,1,текст,2,8', '3,2,текст,1,5',
+        ]))
+        assert '3 rows processed' in output and 'rows/sec' in output, (
+            'Проверьте, что команда load_csv --bulk выводит число '
+            'обработанных строк и скорость загрузки.'
+        )
+        assert Review.objects.count() == 3
+        assert list(Title.objects.order_by('id').values_list(
+            'review_count', 'rating'
+        )) == [(2, 6), (1, 5), (0, None)], (
+            'Проверьте, что после загрузки отзывов командой load_csv '
+            '--bulk рейтинги произведений пересчитаны.'
+        )
+        assert ScoreCount.objects.filter(title_id=1).count() == 2
+        assert [
+            title.name for title in search_titles(Title.objects, 'книга')
+        ] == ['Книга'], (
+            'Проверьте, что после загрузки произведений командой load_csv '
+            '--bulk обновлён поисковый индекс.'
+        )
+
+        pub_date = Review.objects.get(pk=1).pub_date
+        self.load(write_csv(tmp_path, 'review.csv', [
+            'id,title_id,text,author_id,score,pub_date',
+            '1,1,другой текст,1,4,2001-02-03T04:05:06+00:00',
+            '4,3,текст,1,9,2001-02-03T04:05:06+00:00',
+        ]))
+        skipped = Review.objects.get(pk=1)
+        assert (skipped.text, skipped.pub_date) == ('текст', pub_date), (
+            'Проверьте, что load_csv --bulk пропускает существующие строки.'
+        )
+        assert Review.objects.get(pk=4).pub_date.isoformat() == (
+            '2001-02-03T04:05:06+00:00'
+        ), 'Проверьте, что load_csv --bulk сохраняет даты из CSV.'
+        assert Title.objects.get(pk=3).rating == 9
+
+    def test_02_errors(self, tmp_path):
+        from reviews.models import Category, Title
+
+        Category.objects.create(id=1, name='Фильмы', slug='films')
+        with pytest.raises(CommandError):
+            self.load(write_csv(tmp_path, 'titles.csv', [
+                'id,name,year,category_id',
+                '1,Фильм,2000,1', '2,Книга,1990,7', '3,Песня,2010,1'
+            ]))
+        assert list(Title.objects.values_list('id', flat=True)) == [], (
+            'Проверьте, что load_csv --bulk загружает порцию строк одной '
+            'транзакцией.'
+        )
+        with pytest.raises(CommandError):
+            self.load(write_csv(tmp_path, 'titles.csv', [
+                'id,name,year,genre_id', '1,Фильм,2000,1'
+            ]))
@@ -0,0 +1,157 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from reviews.management.commands import load_dataset
+from tests.utils import write_csv
+
+
+def title_indexes():
+    from reviews.models import Title
+
+    with connection.cursor() as cursor:
+        return {
+            name for name, info in connection.introspection.get_constraints(
+                cursor, Title._meta.db_table
+            ).items()
+            if info['index'] and not info['unique']
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25LoadDataset:
+
+    def test_01_dependency_order(self, django_user_model):
+        from reviews.loading import dependency_order
+        from reviews.models import (
+            Category, Comment, Genre, GenreTitle, Review, Title
+        )
+
+        groups = dependency_order([
+            Comment, Review, GenreTitle, Title, Genre, Category,
+            django_user_model
+        ])
+        assert [set(group) for group in groups] == [
+            {Genre, Category, django_user_model},
+            {Title},
+            {GenreTitle, Review},
+            {Comment},
+        ], (
+            'Проверьте, что файлы загружаются после файлов моделей, на '
+            'которые ссылаются их внешние ключи.'
+        )
+
+    def test_02_load_dataset(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        indexes = title_indexes()
+        write_csv(tmp_path, 'comments.csv', [
+            'id,review_id,text,author_id', '1,1,комментарий,2'
+        ])
+        write_csv(tmp_path, 'review.csv', [
+            'id,title_id,text,author_id,score', '1,1,текст,1,7',
+            '2,1,текст,2,9'
+        ])
+        write_csv(tmp_path, 'titles.csv', [
+            'id,name,year,category_id', '1,Фильм,2000,1'
+        ])
+        write_csv(tmp_path, 'genre_title.csv', [
+            'id,title_id,genre_id', '1,1,1'
+        ])
+        write_csv(tmp_path, 'category.csv', ['id,name,slug', '1,Фильмы,films'])
+        write_csv(tmp_path, 'genre.csv', ['id,name,slug', '1,Драма,drama'])
+        write_csv(tmp_path, 'users.csv', [
+            'id,username,email', '1,first,first@yamdb.fake',
+            '2,second,second@yamdb.fake'
+        ])
+        out = StringIO()
+        call_command('load_dataset', str(tmp_path), stdout=out)
+        assert 'Load order: ' in out.getvalue()
+        assert Comment.objects.get().review.title.rating == 8, (
+            'Проверьте, что команда load_dataset загружает все файлы '
+            'каталога и пересчитывает рейтинги.'
+        )
+        assert Title.objects.get().genre.get().slug == 'drama'
+        assert title_indexes() == indexes, (
+            'Проверьте, что команда load_dataset восстанавливает индексы '
+            'после загрузки.'
+        )
+
+        write_csv(tmp_path, 'review.csv', [
+            'id,title_id,text,author_id,score', '3,5,текст,1,7'
+        ])
+        with pytest.raises(CommandError):
+            call_command('load_dataset', str(tmp_path), stdout=StringIO())
+        assert not Review.objects.filter(pk=3).exists(), (
+            'Проверьте, что при нарушении внешних ключей команда '
+            'load_dataset откатывает загрузку.'
+        )
+        assert title_indexes() == indexes, (
+            'Проверьте, что индексы восстанавливаются и после ошибки '
+            'загрузки.'
+        )
+
+    def test_03_concurrent_groups_are_committed(self, tmp_path,
+                                                monkeypatch):
+        from reviews.loading import dependency_order
+        from reviews.models import Category, Review, Title
+
+        class SerialExecutor:
+            """Задачи группы по очереди: SQLite не допускает
+            параллельной записи, а проверяется порядок фиксации."""
+
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def map(self, function, tasks):
+                assert not connection.in_atomic_block, (
+                    'Проверьте, что при нескольких потоках предыдущие '
+                    'группы зафиксированы до загрузки следующей.'
+                )
+                return [function(task) for task in tasks]
+
+        monkeypatch.setattr(load_dataset, 'ThreadPoolExecutor', SerialExecutor)
+        write_csv(tmp_path, 'category.csv', ['id,name,slug', '1,Фильмы,films'])
+        write_csv(tmp_path, 'titles.001.csv', [
+            'id,name,year,category_id', '1,Фильм,2000,1'
+        ])
+        write_csv(tmp_path, 'titles.002.csv', [
+            'id,name,year,category_id', '2,Книга,2001,1'
+        ])
+        write_csv(tmp_path, 'users.csv', [
+            'id,username,email', '1,first,first@yamdb.fake'
+        ])
+        write_csv(tmp_path, 'review.001.csv', [
+            'id,title_id,text,author_id,score', '1,1,текст,1,7',
+        ])
+        write_csv(tmp_path, 'review.002.csv', [
+            'id,title_id,text,author_id,score', '2,5,текст,1,7',
+        ])
+        command = load_dataset.Command(stdout=StringIO())
+        files = command.discover(tmp_path)
+        with pytest.raises(CommandError):
+            command.load_checked(files, dependency_order(list(files)), 1, 2)
+        assert Category.objects.count() == 1
+        assert Title.objects.count() == 2
+        assert list(Review.objects.values_list('id', flat=True)) == [1], (
+            'Проверьте, что при нескольких потоках порция с нарушением '
+            'внешних ключей отклоняется, а загруженные группы остаются.'
+        )
+
+    def test_04_unknown_file(self, tmp_path):
+        write_csv(tmp_path, 'unknown.csv', ['id', '1'])
+        with pytest.raises(CommandError):
+            call_command('load_dataset', str(tmp_path), stdout=StringIO())
+        with pytest.raises(CommandError):
+            call_command(
+                'load_dataset', str(tmp_path / 'empty'), stdout=StringIO()
+            )
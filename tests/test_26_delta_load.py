@@ -0,0 +1,128 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import write_csv
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26DeltaLoad:
+
+    def load(self, path, batch_size=2):
+        out = StringIO()
+        call_command(
+            'load_csv', path, '--delta', f'--batch-size={batch_size}',
+            stdout=out
+        )
+        return out.getvalue()
+
+    def test_01_delta(self, tmp_path):
+        from reviews.models import Category, Genre, Title
+
+        Category.objects.create(id=1, name='Фильмы', slug='films')
+        write_csv(tmp_path, 'genre.csv', ['id,name,slug', '1,Драма,drama'])
+        self.load(str(tmp_path / 'genre.csv'))
+        path = write_csv(tmp_path, 'titles.csv', [
+            'id,name,year,category_id',
+            '1,Фильм,2000,1', '2,Книга,1990,', '3,Песня,2010,1'
+        ])
+        output = self.load(path)
+        assert '3 objects added' in output
+        path = write_csv(tmp_path, 'titles.csv', [
+            'id,name,year,category_id',
+            '1,Фильм,2000,1', '2,Новая книга,1991,', '3,Песня,2010,7',
+            '4,Альбом,2020,1'
+        ])
+        output = self.load(path)
+        assert (
+            '1 objects added, 1 updated, 1 unchanged and 1 skipped' in output
+        ), (
+            'Проверьте, что load_csv --delta добавляет новые строки, '
+            'обновляет изменённые, пропускает неизменённые и не '
+            'прерывается на ошибочной строке.'
+        )
+        assert list(Title.objects.order_by('id').values_list(
+            'name', 'name_key', 'year', 'category_id'
+        )) == [
+            ('Фильм', 'фильм', 2000, 1),
+            ('Новая книга', 'новая книга', 1991, None),
+            ('Песня', 'песня', 2010, 1),
+            ('Альбом', 'альбом', 2020, 1),
+        ], (
+            'Проверьте, что load_csv --delta обновляет изменённые строки '
+            'вместе с ключами поиска.'
+        )
+        assert Genre.objects.get().name == 'Драма'
+
+    def test_02_resume(self, tmp_path):
+        from reviews import loading
+        from reviews.models import LoadCheckpoint, Title
+
+        path = write_csv(tmp_path, 'titles.csv', [
+            'id,name,year', '1,Фильм,2000', '2,Книга,1990', '3,Песня,2010',
+            '4,Альбом,2020'
+        ])
+        upsert_batch = loading.upsert_batch
+        calls = []
+
+        def interrupted(model, rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return upsert_batch(model, rows)
+
+        with mock.patch(
+            'reviews.management.commands.load_csv.upsert_batch',
+            interrupted
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                self.load(path)
+        assert LoadCheckpoint.objects.get().rows == 2
+        assert Title.objects.count() == 2
+
+        output = self.load(path)
+        assert 'Resume titles.csv after 2 rows' in output, (
+            'Проверьте, что прерванная загрузка load_csv --delta '
+            'продолжается с контрольной точки.'
+        )
+        assert '2 objects added' in output
+        assert Title.objects.count() == 4
+        assert not LoadCheckpoint.objects.exists(), (
+            'Проверьте, что контрольная точка удаляется после загрузки '
+            'файла целиком.'
+        )
+
+    def test_03_dates_from_csv(self, tmp_path, django_user_model):
+        from datetime import datetime, timezone
+
+        from reviews.models import Review, Title
+
+        Title.objects.create(id=1, name='Фильм', year=2000)
+        django_user_model.objects.create(
+            id=1, username='first', email='first@yamdb.fake'
+        )
+        django_user_model.objects.create(
+            id=2, username='second', email='second@yamdb.fake'
+        )
+        path = write_csv(tmp_path, 'review.csv', [
+            'id,title_id,text,author_id,score,pub_date',
+            '1,1,текст,1,7,2020-01-13T23:20:02.422Z',
+            '2,1,текст,2,9,2021-05-01T10:00:00+03:00',
+        ])
+        assert '2 objects added' in self.load(path)
+        assert list(Review.objects.order_by('id').values_list(
+            'pub_date', flat=True
+        )) == [
+            datetime(2020, 1, 13, 23, 20, 2, 422000, tzinfo=timezone.utc),
+            datetime(2021, 5, 1, 7, tzinfo=timezone.utc),
+        ], (
+            'Проверьте, что load_csv --delta сохраняет даты из CSV, а не '
+            'время загрузки.'
+        )
+        output = self.load(path)
+        assert '0 objects added, 0 updated, 2 unchanged' in output, (
+            'Проверьте, что повторная загрузка того же файла с датами '
+            'не находит изменённых строк.'
+        )
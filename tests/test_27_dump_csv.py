@@ -0,0 +1,85 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tests.utils import create_reviewed_title
+
+
+def snapshot(django_user_model):
+    from reviews.models import Comment, GenreTitle, Review, Title
+
+    return (
+        list(django_user_model.objects.order_by('id').values_list(
+            'id', 'username', 'role'
+        )),
+        list(Title.objects.order_by('id').values_list(
+            'id', 'name', 'category_id', 'rating'
+        )),
+        list(GenreTitle.objects.order_by('id').values_list(
+            'title_id', 'genre_id'
+        )),
+        list(Review.objects.order_by('id').values_list(
+            'id', 'title_id', 'author_id', 'score', 'pub_date'
+        )),
+        list(Comment.objects.order_by('id').values_list(
+            'id', 'review_id', 'author_id', 'text', 'pub_date'
+        )),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27DumpCsv:
+
+    def test_01_dump_and_load(self, tmp_path, django_user_model):
+        from reviews.models import Category, Genre, Title
+
+        create_reviewed_title(django_user_model)
+        before = snapshot(django_user_model)
+        call_command(
+            'dump_csv', '--all', f'--output-dir={tmp_path}', '--shards=2',
+            '--chunk-size=2', stdout=StringIO()
+        )
+        with open(tmp_path / 'titles.001.csv', encoding='utf-8') as file:
+            assert next(csv.reader(file)) == [
+                'id', 'name', 'year', 'description', 'category_id'
+            ], (
+                'Проверьте, что dump_csv выгружает связи колонками `_id` '
+                'и не выгружает вычисляемые поля.'
+            )
+        with open(tmp_path / 'users.001.csv', encoding='utf-8') as file:
+            assert next(csv.reader(file)) == [
+                'id', 'username', 'email', 'role', 'bio', 'first_name',
+                'last_name'
+            ], (
+                'Проверьте, что dump_csv не выгружает пароли и права '
+                'пользователей.'
+            )
+        assert (tmp_path / 'review.002.csv').exists(), (
+            'Проверьте, что dump_csv --shards делит таблицы на '
+            'пронумерованные файлы.'
+        )
+
+        for model in (Title, Genre, Category, django_user_model):
+            model.objects.all().delete()
+        call_command('load_dataset', str(tmp_path), stdout=StringIO())
+        assert snapshot(django_user_model) == before, (
+            'Проверьте, что выгрузка dump_csv --all загружается командой '
+            'load_dataset без потерь.'
+        )
+
+    def test_02_single_model(self, tmp_path, django_user_model):
+        create_reviewed_title(django_user_model)
+        call_command(
+            'dump_csv', 'genre', f'--output-dir={tmp_path}', stdout=StringIO()
+        )
+        with open(tmp_path / 'genre.csv', encoding='utf-8') as file:
+            assert [row['slug'] for row in csv.DictReader(file)] == [
+                'drama', 'action'
+            ]
+        with pytest.raises(CommandError):
+            call_command('dump_csv', stdout=StringIO())
+        with pytest.raises(CommandError):
+            call_command('dump_csv', 'unknown', stdout=StringIO())
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def generate(seed=7):
+    call_command(
+        'generate_data', '--users=20', '--categories=2', '--genres=5',
+        '--titles=30', '--reviews=150', '--comments=40', f'--seed={seed}',
+        f'--now={NOW.isoformat()}', '--batch-size=16', stdout=StringIO()
+    )
+
+
+def dataset():
+    from reviews.models import Comment, GenreTitle, Review, Title
+
+    return (
+        list(Title.objects.order_by('id').values_list(
+            'name', 'name_key', 'year', 'category_id', 'rating'
+        )),
+        list(GenreTitle.objects.order_by('id').values_list(
+            'title_id', 'genre_id'
+        )),
+        list(Review.objects.order_by('id').values_list(
+            'title_id', 'author_id', 'score', 'pub_date'
+        )),
+        list(Comment.objects.order_by('id').values_list(
+            'review_id', 'author_id', 'text'
+        )),
+    )
+
+
+class Test28GenerateData:
+
+    def test_01_zipf_counts(self):
+        from reviews.generation import zipf_counts
+
+        counts = zipf_counts(1000, 50, 1.0, 100)
+        assert sum(counts) == 1000 and max(counts) <= 100, (
+            'Проверьте, что zipf_counts раскладывает все отзывы и не '
+            'превышает число авторов на произведение.'
+        )
+        assert counts[0] == 100 and counts[10] > counts[40] > 0
+        with pytest.raises(ValueError):
+            zipf_counts(1000, 5, 1.0, 100)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_generate_data(self, django_user_model):
+        from reviews.models import Category, Genre, Review, Title
+
+        generate()
+        assert (
+            django_user_model.objects.count(), Category.objects.count(),
+            Genre.objects.count(), Title.objects.count(),
+            Review.objects.count()
+        ) == (20, 2, 5, 30, 150), (
+            'Проверьте, что команда generate_data создаёт заданное число '
+            'объектов.'
+        )
+        counts = sorted(
+            Title.objects.values_list('review_count', flat=True),
+            reverse=True
+        )
+        assert sum(counts) == 150 and counts[0] > counts[-1], (
+            'Проверьте, что после генерации пересчитаны счётчики отзывов '
+            'и отзывы распределены неравномерно.'
+        )
+        assert Review.objects.filter(
+            pub_date__lt=NOW - timedelta(days=365)
+        ).exists(), 'Проверьте, что даты отзывов распределены по годам.'
+        assert not Review.objects.filter(pub_date__gt=NOW).exists(), (
+            'Проверьте, что даты отзывов отсчитываются от --now.'
+        )
+
+        data = dataset()
+        for model in (Title, Genre, Category, django_user_model):
+            model.objects.all().delete()
+        generate()
+        assert dataset() == data, (
+            'Проверьте, что generate_data с одинаковыми --seed и --now '
+            'создаёт одинаковые данные.'
+        )
+
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_data', '--users=2', '--now=вчера', stdout=StringIO()
+            )
+
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_data', '--users=2', '--titles=2', '--reviews=5',
+                stdout=StringIO()
+            )
@@ -0,0 +1,83 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviewed_title
+
+
+def parse_server_timing(value):
+    metrics = {}
+    for entry in value.split(','):
+        name, *params = entry.strip().split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ServerTiming:
+
+    def test_01_header_and_log(
+        self, settings, client, user_client, django_user_model, caplog
+    ):
+        settings.REQUEST_TIMING = True
+        title, _ = create_reviewed_title(django_user_model)
+        url = '/api/v1/titles/'
+        with caplog.at_level(logging.INFO, logger='api.middleware'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что при REQUEST_TIMING = True ответ содержит '
+            'заголовок Server-Timing.'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert set(metrics) == {'db', 'serializer', 'auth', 'total'}, (
+            'Проверьте, что Server-Timing содержит время БД, сериализации, '
+            'проверки доступа и всего запроса.'
+        )
+        assert metrics['db']['desc'] == (
+            f'"{len(context.captured_queries)} queries"'
+        ), 'Проверьте, что Server-Timing сообщает число SQL-запросов.'
+        total = float(metrics['total']['dur'])
+        assert all(
+            0 <= float(metric['dur']) <= total for metric in metrics.values()
+        )
+        assert float(metrics['serializer']['dur']) > 0
+
+        record, = [
+            record for record in caplog.records
+            if record.name == 'api.middleware'
+        ]
+        assert record.view == 'TitleViewSet.list', (
+            'Проверьте, что запись лога помечена представлением и '
+            'действием DRF.'
+        )
+        assert record.db_queries == len(context.captured_queries)
+        assert record.status == HTTPStatus.OK
+        assert record.total_ms == total
+
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger='api.middleware'):
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв', 'score': 8}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert caplog.records[-1].view == 'ReviewViewSet.create'
+        assert caplog.records[-1].auth_ms > 0, (
+            'Проверьте, что время аутентификации и проверки прав '
+            'учитывается.'
+        )
+
+    def test_02_disabled_by_default(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger='api.middleware'):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что без REQUEST_TIMING заголовок Server-Timing '
+            'не добавляется.'
+        )
+        assert not caplog.records
@@ -305,3 +305,85 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def write_csv(directory, name, lines):
+    path = directory / name
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def create_reviewed_title(django_user_model):
+    from reviews.models import (
+        Category, Comment, Genre, GenreTitle, Review, Title
+    )
+
+    category = Category.objects.create(name='Фильмы', slug='films')
+    genres = [
+        Genre.objects.create(name=name, slug=slug)
+        for name, slug in (('Драма', 'drama'), ('Боевик', 'action'))
+    ]
+    titles = [
+        Title.objects.create(
+            name='Фильм', year=2000, description='Описание',
+            category=category
+        ),
+        Title.objects.create(name='Книга', year=1990, description=''),
+    ]
+    for genre in genres:
+        GenreTitle.objects.create(title=titles[0], genre=genre)
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'user{number}', email=f'user{number}@yamdb.fake'
+        )
+        for number in range(3)
+    ]
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text=f'Отзыв {number}',
+            score=number + 5
+        )
+        for number, author in enumerate(authors)
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return titles[0], reviews[0]
+
+
+def create_title_page(django_user_model, size):
+    from reviews.models import (
+        Category, Comment, Genre, GenreTitle, Review, Title
+    )
+
+    category = Category.objects.create(name='Фильмы', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {number}', slug=f'g{number}')
+        for number in range(15)
+    ]
+    titles = []
+    for number in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000,
+            description='Описание ' * 20, category=category
+        )
+        for shift in range(3):
+            GenreTitle.objects.create(
+                title=title, genre=genres[(number + shift) % len(genres)]
+            )
+        titles.append(title)
+    review = None
+    for number in range(size):
+        author = django_user_model.objects.create_user(
+            username=f'user{number}', email=f'user{number}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=titles[0], author=author, text='Текст отзыва ' * 20,
+            score=number % 10 + 1
+        )
+        Comment.objects.create(
+            review=titles[0].reviews.order_by('id').first(),
+            author=author, text='Текст комментария ' * 10
+        )
+    return titles[0], review